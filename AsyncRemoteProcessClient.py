@@ -0,0 +1,66 @@
+import queue
+import threading
+import time
+
+from RemoteProcessClient import RemoteProcessClient
+
+
+class AsyncRemoteProcessClient(RemoteProcessClient):
+    # Client doing the socket I/O of the game in a background thread. The thread decodes the next player context
+    # into a ready queue and sends the moves, so that writing the moves doesn't block the strategy and the context
+    # is decoded as soon as it arrives. The protocol is lock-step, the next context is only read after the moves of
+    # the current one are sent, so all socket and recorder access stays ordered in the background thread.
+    CLOSE_TIMEOUT_SECONDS = 1.0
+
+    def __init__(self, host, port, socket=None):
+        super().__init__(host, port, socket)
+        # Decoded player contexts, or the exception the background thread has failed with.
+        self.ready_contexts = queue.Queue()
+        # Encoded move frames, None stops the background thread.
+        self.move_frames = queue.Queue()
+        self.thread = None
+        # Time the strategy thread has waited for decoded contexts, the socket is only touched by the background thread.
+        self.wait_seconds = 0.0
+
+    def read_player_context_message(self):
+        # The handshake is synchronous, the background thread starts with the first player context.
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run_io, name="RemoteProcessClient", daemon=True)
+            self.thread.start()
+
+        started_at = time.perf_counter()
+        player_context = self.ready_contexts.get()
+        self.wait_seconds += time.perf_counter() - started_at
+        if isinstance(player_context, Exception):
+            raise player_context
+        return player_context
+
+    def write_moves_message(self, moves):
+        # Only encodes the moves, they're sent by the background thread.
+        self.write_enum(RemoteProcessClient.MessageType.MOVE)
+        self.write_moves(moves)
+        frame = bytes(self.write_buffer[:self.write_offset])
+        self.write_offset = 0
+        self.move_frames.put(frame)
+
+    def run_io(self):
+        try:
+            while True:
+                player_context = RemoteProcessClient.read_player_context_message(self)
+                self.ready_contexts.put(player_context)
+                if player_context is None:
+                    return
+                frame = self.move_frames.get()
+                if frame is None:
+                    return
+                self.write_bytes(frame)
+                self.flush()
+        except Exception as exception:
+            self.ready_contexts.put(exception)
+
+    def close(self):
+        if self.thread is not None:
+            # The thread may be stuck waiting for the server, it's a daemon then.
+            self.move_frames.put(None)
+            self.thread.join(AsyncRemoteProcessClient.CLOSE_TIMEOUT_SECONDS)
+        super().close()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import os
+import random
+import resource
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from model.Bonus import Bonus
+from model.BonusType import BonusType
+from model.Building import Building
+from model.BuildingType import BuildingType
+from model.Faction import Faction
+from model.Game import Game
+from model.Minion import Minion
+from model.MinionType import MinionType
+from model.Projectile import Projectile
+from model.ProjectileType import ProjectileType
+from model.SkillType import SkillType
+from model.Status import Status
+from model.StatusType import StatusType
+from model.Tree import Tree
+from model.Wizard import Wizard
+from MockServer import GAME_PARAMETERS, MockServer
+from RemoteProcessClient import RemoteProcessClient
+from StartupCache import StartupCache
+
+
+# Units constructed per tick, roughly a crowded tick of a real game.
+TREE_COUNT = 300
+MINION_COUNT = 60
+BUILDING_COUNT = 14
+WIZARD_COUNT = 10
+PROJECTILE_COUNT = 10
+BONUS_COUNT = 2
+
+MODEL_CLASSES = (Bonus, Building, Minion, Projectile, Status, Tree, Wizard)
+
+# Everything the runner imports up to its first move.
+RUNNER_IMPORTS = "import RemoteProcessClient, MyStrategy, ThreatMap"
+
+
+class Benchmark:
+    def __init__(self):
+        self.random = random.Random(42)
+
+    def run(self):
+        command = sys.argv[1] if sys.argv.__len__() > 1 else "memory"
+        getattr(self, "run_" + command)(*sys.argv[2:])
+
+    def run_memory(self, variant=None, tick_count="200"):
+        if variant is None:
+            # Run each variant in its own process, so that RSS of one doesn't affect the other.
+            for variant in ("dict", "slots"):
+                subprocess.check_call([sys.executable, __file__, "memory", variant, tick_count])
+            return
+
+        model_classes = {model_class: model_class for model_class in MODEL_CLASSES}
+        if variant == "dict":
+            # Same constructors, but attributes are stored in a per-instance __dict__.
+            model_classes = {
+                model_class: type(model_class.__name__, (), {"__init__": model_class.__init__})
+                for model_class in MODEL_CLASSES
+            }
+
+        tick_count = int(tick_count)
+
+        # Construction time, objects are dropped at the end of each tick. The best tick is the least noisy one.
+        construction_time = float("+inf")
+        unit_count = 0
+        for _ in range(tick_count):
+            started_at = time.perf_counter()
+            unit_count = len(self.build_units(model_classes))
+            construction_time = min(construction_time, time.perf_counter() - started_at)
+
+        # Memory footprint, objects of all ticks are kept alive like the unit cache of the client does.
+        ticks = []
+        start_rss = Benchmark.get_rss()
+        tracemalloc.start()
+        for _ in range(tick_count):
+            ticks.append(self.build_units(model_classes))
+        allocated_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss = Benchmark.get_rss() - start_rss
+
+        print("%s: %.1f us per tick (%.2f us per unit), %.1f KiB per tick allocated, RSS +%.1f KiB per tick" % (
+            variant, 1e6 * construction_time, 1e6 * construction_time / unit_count,
+            allocated_bytes / 1024.0 / tick_count, rss / 1024.0 / tick_count,
+        ))
+
+    def run_server(self, tick_count="2000", team_size="1"):
+        # Ticks per second of the runner playing a synthetic game against the local mock server, end to end.
+        tick_count, team_size = int(tick_count), int(team_size)
+        game = Game(**GAME_PARAMETERS)
+        # Generated upfront, so that only the protocol and the strategy are measured.
+        player_contexts = list(MockServer.generate_player_contexts(game, tick_count, team_size))
+
+        listener = MockServer.listen(port=0)
+        runner = subprocess.Popen([
+            sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Runner.py"),
+            "127.0.0.1", str(listener.getsockname()[1]), "0000000000000000",
+        ])
+        try:
+            server = MockServer.accept(listener)
+        finally:
+            listener.close()
+        try:
+            served_tick_count, seconds = server.serve(game, player_contexts, team_size)
+        finally:
+            server.close()
+        runner.wait()
+
+        print("%d ticks in %.2f s, %.1f ticks/s, %.2f ms per tick" % (
+            served_tick_count, seconds, served_tick_count / seconds, 1e3 * seconds / served_tick_count,
+        ))
+
+    def run_startup(self, run_count="10", decode_count="1000"):
+        # Latency from starting the runner to its first move: interpreter start, imports and connection, then the
+        # game context and the first tick. Slow bots are dropped by the server while connecting.
+        game = Game(**GAME_PARAMETERS)
+        player_context = next(MockServer.generate_player_contexts(game, 1))
+        connect_seconds, first_move_seconds = [], []
+
+        for _ in range(int(run_count)):
+            listener = MockServer.listen(port=0)
+            started_at = time.perf_counter()
+            runner = subprocess.Popen([
+                sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "Runner.py"),
+                "127.0.0.1", str(listener.getsockname()[1]), "0000000000000000",
+            ])
+            try:
+                server = MockServer.accept(listener)
+            finally:
+                listener.close()
+            connect_seconds.append(time.perf_counter() - started_at)
+            try:
+                server.read_token_message()
+                server.read_protocol_version_message()
+                server.write_team_size_message(1)
+                server.write_game_context_message(game)
+                server.write_player_context_message(player_context)
+                server.read_moves_message()
+                first_move_seconds.append(time.perf_counter() - started_at)
+                server.write_game_over_message()
+            finally:
+                server.close()
+            runner.wait()
+
+        # The game context on its own, decoded and with all of its fields read.
+        server_socket, client_socket = socket.socketpair()
+        server, client = MockServer(server_socket), RemoteProcessClient(None, None, client_socket)
+        decode_seconds, access_seconds = [], []
+        for _ in range(int(decode_count)):
+            server.write_game_context_message(game)
+            started_at = time.perf_counter()
+            decoded_game = client.read_game_context_message()
+            decode_seconds.append(time.perf_counter() - started_at)
+            for name in Game.__slots__:
+                getattr(decoded_game, name)
+            access_seconds.append(time.perf_counter() - started_at)
+        server.close()
+        client.close()
+
+        print("connected in %.1f ms, first move in %.1f ms (median of %d runs, best %.1f ms)" % (
+            1e3 * statistics.median(connect_seconds), 1e3 * statistics.median(first_move_seconds),
+            len(first_move_seconds), 1e3 * min(first_move_seconds),
+        ))
+        print("game context decoded in %.1f us, %.1f us with all fields read (median of %d)" % (
+            1e6 * statistics.median(decode_seconds), 1e6 * statistics.median(access_seconds), len(decode_seconds),
+        ))
+
+    def run_imports(self, run_count="10", top_count="10"):
+        # Import time of the runner from -X importtime, with the model package imported as usual and from the bundle.
+        # The first run of each starts without the startup cache.
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for title, code in (
+            ("default", RUNNER_IMPORTS),
+            ("fast startup", "from ModelBundle import ModelBundle; ModelBundle.install(); " + RUNNER_IMPORTS),
+        ):
+            shutil.rmtree(StartupCache.DIRECTORY, ignore_errors=True)
+            totals, self_times_by_name = [], {}
+            for _ in range(int(run_count) + 1):
+                output = subprocess.run(
+                    [sys.executable, "-X", "importtime", "-c", code],
+                    cwd=directory, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+                ).stderr
+                total = 0
+                for line in output.splitlines():
+                    if not line.startswith("import time:") or "self [us]" in line:
+                        continue
+                    self_time, _, name = line[len("import time:"):].split("|")
+                    total += int(self_time)
+                    self_times_by_name.setdefault(name.strip(), []).append(int(self_time))
+                totals.append(total)
+
+            print("%s: %.1f ms cold, %.1f ms warm (median of %d runs)" % (
+                title, 1e-3 * totals[0], 1e-3 * statistics.median(totals[1:]), len(totals) - 1,
+            ))
+            medians = sorted(
+                ((statistics.median(self_times), name) for name, self_times in self_times_by_name.items()),
+                reverse=True,
+            )
+            for self_time, name in medians[:int(top_count)]:
+                print("  %8.1f ms  %s" % (1e-3 * self_time, name))
+
+    def run_trees(self, decode_count="1000"):
+        # Trees of a message decoded into objects and into views, then with the position of each tree read.
+        model_classes = {model_class: model_class for model_class in MODEL_CLASSES}
+        trees = self.build_units(model_classes)[:TREE_COUNT]
+        for tree_views in (False, True):
+            server_socket, client_socket = socket.socketpair()
+            server, client = RemoteProcessClient(None, None, server_socket), RemoteProcessClient(None, None, client_socket)
+            client.tree_views = tree_views
+            decode_seconds, access_seconds = [], []
+            for _ in range(int(decode_count)):
+                server.write_trees(trees)
+                server.flush()
+                started_at = time.perf_counter()
+                decoded_trees = client.read_trees()
+                decode_seconds.append(time.perf_counter() - started_at)
+                for tree in decoded_trees:
+                    tree.x, tree.y, tree.radius
+                access_seconds.append(time.perf_counter() - started_at)
+            server.close()
+            client.close()
+
+            print("%s: %d trees decoded in %.1f us, %.1f us with positions read (median of %d)" % (
+                "views" if tree_views else "objects", len(trees), 1e6 * statistics.median(decode_seconds),
+                1e6 * statistics.median(access_seconds), len(decode_seconds),
+            ))
+
+    def build_units(self, model_classes):
+        units = []
+        uniform = self.random.uniform
+
+        for i in range(TREE_COUNT):
+            units.append(model_classes[Tree](
+                i, uniform(0.0, 4000.0), uniform(0.0, 4000.0), 0.0, 0.0, 0.0, Faction.OTHER, uniform(20.0, 50.0),
+                10, 10, []
+            ))
+        for i in range(MINION_COUNT):
+            units.append(model_classes[Minion](
+                1000 + i, uniform(0.0, 4000.0), uniform(0.0, 4000.0), uniform(-3.0, 3.0), uniform(-3.0, 3.0),
+                uniform(-3.14, 3.14), Faction.ACADEMY, 25.0, 100, 100, [], MinionType.ORC_WOODCUTTER, 400.0, 12, 60, 0
+            ))
+        for i in range(BUILDING_COUNT):
+            units.append(model_classes[Building](
+                2000 + i, uniform(0.0, 4000.0), uniform(0.0, 4000.0), 0.0, 0.0, 0.0, Faction.RENEGADES, 50.0, 1000,
+                1000, [], BuildingType.GUARDIAN_TOWER, 600.0, 600.0, 36, 240, 0
+            ))
+        for i in range(WIZARD_COUNT):
+            statuses = [model_classes[Status](3000 + i, StatusType.EMPOWERED, i, i, 100)]
+            units.append(model_classes[Wizard](
+                i + 1, uniform(0.0, 4000.0), uniform(0.0, 4000.0), uniform(-4.0, 4.0), uniform(-4.0, 4.0),
+                uniform(-3.14, 3.14), Faction.ACADEMY, 35.0, 100, 100, statuses, i + 1, False, 100, 100, 600.0, 500.0,
+                0, 0, [SkillType.FIREBALL], 0, [0, 0, 0, 0, 0, 0, 0], False, []
+            ))
+        for i in range(PROJECTILE_COUNT):
+            units.append(model_classes[Projectile](
+                4000 + i, uniform(0.0, 4000.0), uniform(0.0, 4000.0), 40.0, 0.0, 0.0, Faction.ACADEMY, 10.0,
+                ProjectileType.MAGIC_MISSILE, 1, 1
+            ))
+        for i in range(BONUS_COUNT):
+            units.append(model_classes[Bonus](
+                5000 + i, 1200.0, 1200.0, 0.0, 0.0, 0.0, Faction.OTHER, 20.0, BonusType.EMPOWER
+            ))
+
+        return units
+
+    @staticmethod
+    def get_rss():
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * resource.getpagesize()
+        except IOError:
+            # Only peak RSS is available here, it is reported in kilobytes on Linux and in bytes on macOS.
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+if __name__ == "__main__":
+    Benchmark().run()
@@ -0,0 +1,69 @@
+import collections
+import sys
+import time
+
+
+class Deadline:
+    # Time budget of a move. Expensive stages check it as they go and settle for the best answer found so far when
+    # the time is over. Quality of a stage is the share of its work done, it's 1.0 for a finished stage.
+
+    def __init__(self, budget=None):
+        # Seconds, no limit if None.
+        self.budget = budget
+        self.started_at = 0.0
+        self.expires_at = float("+inf")
+        # Run count, cut count, quality sum and seconds sum by stage name.
+        self.stats_by_stage = collections.OrderedDict()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        if self.budget is not None:
+            self.expires_at = self.started_at + self.budget
+
+    def is_expired(self) -> bool:
+        return time.perf_counter() >= self.expires_at
+
+    def stage(self, name):
+        return Deadline.Stage(self, name)
+
+    def report(self, name, quality, seconds):
+        stats = self.stats_by_stage.get(name)
+        if stats is None:
+            stats = self.stats_by_stage[name] = [0, 0, 0.0, 0.0]
+        stats[0] += 1
+        if quality < 1.0:
+            stats[1] += 1
+        stats[2] += quality
+        stats[3] += seconds
+
+    def print_summary(self, title, output=sys.stderr):
+        print("%s: %s." % (title, ", ".join(
+            "%s %d runs, %d cut, quality %.3f, %.3f ms avg" % (
+                name, run_count, cut_count, quality_sum / run_count, 1e3 * seconds_sum / run_count,
+            )
+            for name, (run_count, cut_count, quality_sum, seconds_sum) in self.stats_by_stage.items()
+        ) or "no stages"), file=output)
+
+    class Stage:
+        # Reports the quality and the time of a stage when it's left.
+
+        def __init__(self, deadline, name):
+            self.deadline = deadline
+            self.name = name
+            self.quality = 1.0
+            self.started_at = 0.0
+
+        def __enter__(self):
+            self.started_at = time.perf_counter()
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            self.deadline.report(self.name, self.quality, time.perf_counter() - self.started_at)
+            return False
+
+        def is_expired(self, done, total) -> bool:
+            # Checks the deadline, when it's over the stage is cut with done of total work.
+            if not self.deadline.is_expired():
+                return False
+            self.quality = done / total
+            return True
@@ -0,0 +1,36 @@
+import math
+
+from model.Unit import Unit
+from model.World import World
+
+
+class GeometryCache:
+    # Distances and angles from the acting wizard to other units by unit id. Units don't move within a tick, so each
+    # value is computed once per move. The cache is cleared when another wizard acts or a new world comes.
+
+    def __init__(self):
+        self.me_id = None
+        self.world = None
+        self.distance_by_id = {}
+        self.angle_by_id = {}
+
+    def update(self, me: Unit, world: World):
+        # Each tick has its own world.
+        if me.id == self.me_id and world is self.world:
+            return
+        self.me_id = me.id
+        self.world = world
+        self.distance_by_id.clear()
+        self.angle_by_id.clear()
+
+    def get_distance_to_unit(self, me: Unit, unit: Unit):
+        distance = self.distance_by_id.get(unit.id)
+        if distance is None:
+            distance = self.distance_by_id[unit.id] = math.hypot(unit.x - me.x, unit.y - me.y)
+        return distance
+
+    def get_angle_to_unit(self, me: Unit, unit: Unit):
+        angle = self.angle_by_id.get(unit.id)
+        if angle is None:
+            angle = self.angle_by_id[unit.id] = me.get_angle_to(unit.x, unit.y)
+        return angle
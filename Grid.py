@@ -0,0 +1,32 @@
+import math
+
+
+class Grid:
+    # Square grid of cells over the map, indexed row by row. ThreatMap and Navigation are laid over the same grid,
+    # so that a cell index of one is a cell index of the other.
+    CELL_SIZE = 50.0
+
+    def __init__(self, map_size=4000.0):
+        self.size = int(math.ceil(map_size / Grid.CELL_SIZE))
+
+    def get_disk_spans(self, x, y, radius):
+        # Row spans (start index, end index) of cells whose centers are within the circle.
+        cell_size, size = Grid.CELL_SIZE, self.size
+        min_y, max_y = max(0, int((y - radius) / cell_size)), min(size - 1, int((y + radius) / cell_size))
+        for cell_y in range(min_y, max_y + 1):
+            dy = (cell_y + 0.5) * cell_size - y
+            if dy * dy > radius * radius:
+                continue
+            half_width = math.sqrt(radius * radius - dy * dy)
+            min_x = max(0, int(math.ceil((x - half_width) / cell_size - 0.5)))
+            max_x = min(size - 1, int(math.floor((x + half_width) / cell_size - 0.5)))
+            if min_x <= max_x:
+                yield cell_y * size + min_x, cell_y * size + max_x + 1
+
+    def get_index(self, x, y):
+        cell_x = min(self.size - 1, max(0, int(x / Grid.CELL_SIZE)))
+        cell_y = min(self.size - 1, max(0, int(y / Grid.CELL_SIZE)))
+        return cell_y * self.size + cell_x
+
+    def get_center(self, index):
+        return (index % self.size + 0.5) * Grid.CELL_SIZE, (index // self.size + 0.5) * Grid.CELL_SIZE
@@ -0,0 +1,232 @@
+import collections
+import math
+import sys
+import time
+
+
+class LatencyMonitor:
+    # Per-tick timings of the runner: waiting for the server, decoding, each strategy move and writing the moves.
+    # Each phase has a histogram of the last ticks for rolling percentiles and one of the whole game for the summary.
+    # Counters, like the socket traffic of the client, are reported the same way with means and maximums. Path
+    # searches are a phase of their own, it's a part of the moves.
+    WINDOW_TICKS = 1000
+    REPORT_INTERVAL_TICKS = 1000
+    # A tick taking this fraction of the budget is reported.
+    WARNING_FRACTION = 0.8
+
+    # Logarithmic buckets from a microsecond up, each one is 10% wider than the previous one.
+    MIN_SECONDS = 1e-6
+    BUCKET_FACTOR = 1.1
+    BUCKET_COUNT = 256
+
+    # Client statistics counted per tick: the player context that was read and the moves of the previous tick.
+    IO_COUNTERS = (
+        ("received bytes", "received_byte_count"), ("receive calls", "receive_call_count"),
+        ("sent bytes", "sent_byte_count"), ("send calls", "send_call_count"),
+    )
+
+    def __init__(self, budget, output=sys.stderr):
+        self.budget = budget
+        self.output = output
+        # Phases in the order they appear.
+        self.phases = []
+        self.window_by_phase = {}
+        self.window_counts_by_phase = {}
+        self.counts_by_phase = {}
+        self.max_seconds_by_phase = {}
+        self.tick_seconds_by_phase = {}
+        # Counters in the order they appear.
+        self.counters = []
+        self.window_by_counter = {}
+        self.total_by_counter = {}
+        self.max_by_counter = {}
+        self.tick_values_by_counter = {}
+        self.tick_count = 0
+        self.warning_count = 0
+        self.socket = None
+        self.client = None
+        # Client statistics at the last read.
+        self.io_counts = None
+        # Path search totals at the last tick.
+        self.search_seconds = 0.0
+        self.expanded_node_count = 0
+        self.tick_started_at = 0.0
+        self.marked_at = 0.0
+
+    def attach(self, remote_process_client):
+        self.client = remote_process_client
+        if hasattr(remote_process_client, "wait_seconds"):
+            # The background thread of the client reads the socket, waiting for its decoded context is the read.
+            return
+        # Time spent waiting in the socket is told apart from decoding.
+        self.socket = LatencyMonitor.TimedSocket(remote_process_client.socket)
+        remote_process_client.socket = self.socket
+
+    def start_tick(self):
+        self.tick_seconds_by_phase.clear()
+        self.tick_values_by_counter.clear()
+        if self.client is not None and self.io_counts is None:
+            # The handshake and the game context aren't a tick.
+            self.io_counts = self.get_io_counts()
+        if self.socket is not None:
+            self.socket.receive_seconds = 0.0
+        elif self.client is not None:
+            self.client.wait_seconds = 0.0
+        self.tick_started_at = self.marked_at = time.perf_counter()
+
+    def end_read(self):
+        now = time.perf_counter()
+        if self.socket is not None:
+            receive_seconds = self.socket.receive_seconds
+        else:
+            receive_seconds = self.client.wait_seconds if self.client is not None else 0.0
+        self.record("read", receive_seconds)
+        self.record("decode", now - self.marked_at - receive_seconds)
+        if self.client is not None:
+            io_counts = self.get_io_counts()
+            for (counter, _), value, previous_value in zip(LatencyMonitor.IO_COUNTERS, io_counts, self.io_counts):
+                self.count(counter, value - previous_value)
+            self.io_counts = io_counts
+        self.marked_at = now
+
+    def get_io_counts(self):
+        return tuple(getattr(self.client, name) for _, name in LatencyMonitor.IO_COUNTERS)
+
+    def end_move(self, wizard_index):
+        now = time.perf_counter()
+        self.record("move %d" % wizard_index, now - self.marked_at)
+        self.marked_at = now
+
+    def end_search(self, search_seconds, expanded_node_count):
+        # Takes the totals of the game, the difference is this tick's.
+        self.record("path", search_seconds - self.search_seconds)
+        self.count("expanded nodes", expanded_node_count - self.expanded_node_count)
+        self.search_seconds = search_seconds
+        self.expanded_node_count = expanded_node_count
+
+    def end_tick(self):
+        now = time.perf_counter()
+        self.record("write", now - self.marked_at)
+        # Waiting for the server isn't our time.
+        seconds = now - self.tick_started_at - self.tick_seconds_by_phase.get("read", 0.0)
+        self.record("tick", seconds)
+        self.tick_count += 1
+
+        if seconds > LatencyMonitor.WARNING_FRACTION * self.budget:
+            self.warning_count += 1
+            print("Tick %d took %.2f ms of %.2f ms budget: %s." % (
+                self.tick_count, 1e3 * seconds, 1e3 * self.budget, ", ".join(
+                    "%s %.2f ms" % (phase, 1e3 * phase_seconds)
+                    for phase, phase_seconds in self.tick_seconds_by_phase.items()
+                    if phase != "tick"
+                ) + "".join(", %s %d" % item for item in self.tick_values_by_counter.items()),
+            ), file=self.output)
+        if self.tick_count % LatencyMonitor.REPORT_INTERVAL_TICKS == 0:
+            self.print_window()
+
+    def record(self, phase, seconds):
+        if phase not in self.window_by_phase:
+            self.phases.append(phase)
+            self.window_by_phase[phase] = collections.deque()
+            self.window_counts_by_phase[phase] = [0] * LatencyMonitor.BUCKET_COUNT
+            self.counts_by_phase[phase] = [0] * LatencyMonitor.BUCKET_COUNT
+            self.max_seconds_by_phase[phase] = 0.0
+
+        self.tick_seconds_by_phase[phase] = seconds
+        bucket = LatencyMonitor.get_bucket(seconds)
+        window, window_counts = self.window_by_phase[phase], self.window_counts_by_phase[phase]
+        if len(window) == LatencyMonitor.WINDOW_TICKS:
+            window_counts[LatencyMonitor.get_bucket(window.popleft())] -= 1
+        window.append(seconds)
+        window_counts[bucket] += 1
+        self.counts_by_phase[phase][bucket] += 1
+        if seconds > self.max_seconds_by_phase[phase]:
+            self.max_seconds_by_phase[phase] = seconds
+
+    def count(self, counter, value):
+        if counter not in self.window_by_counter:
+            self.counters.append(counter)
+            self.window_by_counter[counter] = collections.deque()
+            self.total_by_counter[counter] = 0
+            self.max_by_counter[counter] = 0
+
+        self.tick_values_by_counter[counter] = value
+        window = self.window_by_counter[counter]
+        if len(window) == LatencyMonitor.WINDOW_TICKS:
+            window.popleft()
+        window.append(value)
+        self.total_by_counter[counter] += value
+        if value > self.max_by_counter[counter]:
+            self.max_by_counter[counter] = value
+
+    def print_window(self):
+        print("Last %d ticks up to tick %d: %s." % (
+            min(self.tick_count, LatencyMonitor.WINDOW_TICKS), self.tick_count, ", ".join([
+                LatencyMonitor.format_phase(
+                    phase, self.window_counts_by_phase[phase], max(self.window_by_phase[phase]),
+                )
+                for phase in self.phases
+            ] + [
+                "%s mean %.1f max %d" % (
+                    counter, sum(self.window_by_counter[counter]) / len(self.window_by_counter[counter]),
+                    max(self.window_by_counter[counter]),
+                )
+                for counter in self.counters
+            ]),
+        ), file=self.output)
+
+    def print_summary(self):
+        print("%d ticks, %d over %.0f%% of %.2f ms budget." % (
+            self.tick_count, self.warning_count, 100.0 * LatencyMonitor.WARNING_FRACTION, 1e3 * self.budget,
+        ), file=self.output)
+        for phase in self.phases:
+            print("  %s." % LatencyMonitor.format_phase(
+                phase, self.counts_by_phase[phase], self.max_seconds_by_phase[phase],
+            ), file=self.output)
+        for counter in self.counters:
+            total = self.total_by_counter[counter]
+            print("  %s total %d mean %.1f max %d." % (
+                counter, total, total / self.tick_count if self.tick_count else 0.0,
+                self.max_by_counter[counter],
+            ), file=self.output)
+
+    @staticmethod
+    def format_phase(phase, counts, max_seconds):
+        return "%s p50 %.3f ms p99 %.3f ms max %.3f ms" % (
+            phase, 1e3 * LatencyMonitor.get_percentile(counts, 0.5), 1e3 * LatencyMonitor.get_percentile(counts, 0.99),
+            1e3 * max_seconds,
+        )
+
+    @staticmethod
+    def get_bucket(seconds):
+        if seconds <= LatencyMonitor.MIN_SECONDS:
+            return 0
+        bucket = int(math.log(seconds / LatencyMonitor.MIN_SECONDS, LatencyMonitor.BUCKET_FACTOR)) + 1
+        return min(bucket, LatencyMonitor.BUCKET_COUNT - 1)
+
+    @staticmethod
+    def get_percentile(counts, fraction):
+        # Upper bound of the bucket the percentile falls into.
+        rank = fraction * sum(counts)
+        total = 0
+        for bucket, count in enumerate(counts):
+            total += count
+            if count and total >= rank:
+                return LatencyMonitor.MIN_SECONDS * LatencyMonitor.BUCKET_FACTOR ** bucket
+        return 0.0
+
+    class TimedSocket:
+        # Socket wrapper counting the time spent in receiving.
+
+        def __init__(self, socket):
+            self.socket = socket
+            self.receive_seconds = 0.0
+
+        def recv_into(self, buffer):
+            started_at = time.perf_counter()
+            chunk_size = self.socket.recv_into(buffer)
+            self.receive_seconds += time.perf_counter() - started_at
+            return chunk_size
+
+        def __getattr__(self, name):
+            return getattr(self.socket, name)
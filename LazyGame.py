@@ -0,0 +1,70 @@
+import struct
+
+from model.Game import Game
+
+
+class LazyGame(Game):
+    # Game which keeps the raw message and unpacks each constant on first access, the value is then kept in its slot.
+    # The raw message is the fixed head, level_up_xp_values as an int count and the ints, then the fixed tail.
+    __slots__ = ("buffer", "tail_offset", "fields")
+
+    def __init__(self, buffer, tail_offset, fields):
+        # Game constructor isn't called, so all constants are missing until they're read.
+        self.buffer = buffer
+        self.tail_offset = tail_offset
+        # Offset table, see get_fields.
+        self.fields = fields
+
+    def __getattr__(self, name):
+        # Only called for slots which aren't filled yet.
+        if name in LazyGame.__slots__:
+            raise AttributeError(name)
+        field = self.fields.get(name)
+        if field is None:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        value_struct, offset, is_tail = field
+        if is_tail:
+            offset += self.tail_offset
+        value, = value_struct.unpack_from(self.buffer, offset)
+        if name == "level_up_xp_values":
+            # It's the count, the ints follow.
+            value = list(struct.unpack_from(
+                LazyGame.get_format(value_struct)[0] + str(value) + "i", self.buffer, offset + value_struct.size,
+            )) if value >= 0 else None
+        setattr(self, name, value)
+        return value
+
+    @staticmethod
+    def get_fields(head_struct: struct.Struct, tail_struct: struct.Struct):
+        # Field name to (struct, offset, whether the offset is from the tail) from the formats of the fixed parts,
+        # fields are in the order of the Game constructor. level_up_xp_values has the struct of its count.
+        names = Game.__slots__
+        middle = names.index("level_up_xp_values")
+        head_format, tail_format = LazyGame.get_format(head_struct), LazyGame.get_format(tail_struct)
+        byte_order = head_format[0]
+        fields = {}
+        for part_names, part_format, is_tail in (
+            (names[:middle], head_format, False), (names[middle + 1:], tail_format, True),
+        ):
+            codes = []
+            count = ""
+            for code in part_format[1:]:
+                if code.isdigit():
+                    count += code
+                else:
+                    codes.extend(code * int(count or 1))
+                    count = ""
+            if len(codes) != len(part_names):
+                raise ValueError("Format %s doesn't match Game fields." % part_format)
+            offset = 0
+            for name, code in zip(part_names, codes):
+                value_struct = struct.Struct(byte_order + code)
+                fields[name] = (value_struct, offset, is_tail)
+                offset += value_struct.size
+        fields["level_up_xp_values"] = (struct.Struct(byte_order + "i"), head_struct.size, False)
+        return fields
+
+    @staticmethod
+    def get_format(value_struct: struct.Struct):
+        # Struct.format is bytes before Python 3.7.
+        return value_struct.format.decode() if isinstance(value_struct.format, bytes) else value_struct.format
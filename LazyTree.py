@@ -0,0 +1,35 @@
+from model.Tree import Tree
+
+
+class LazyTree(Tree):
+    # Tree which is a view into a copy of the raw tree records of a message, see RemoteProcessClient.read_tree_views.
+    # Only the id is decoded up front. On first access to any other field the whole record is unpacked into the slots.
+    # Pickled as a plain Tree, the buffer isn't sent.
+    __slots__ = ("buffer", "offset", "layout")
+
+    # Arguments of the Tree constructor.
+    FIELDS = ("id", "x", "y", "speed_x", "speed_y", "angle", "faction", "radius", "life", "max_life", "statuses")
+
+    def __init__(self, buffer, offset, layout, id):
+        # Tree constructor isn't called, so other fields are missing until they're read.
+        self.buffer = buffer
+        self.offset = offset
+        # Struct of the record and the decoding table of faction.
+        self.layout = layout
+        self.id = id
+
+    def __getattr__(self, name):
+        # Only called for slots which aren't filled yet.
+        if name not in LazyTree.FIELDS:
+            raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+        record_struct, faction_table = self.layout
+        (
+            _, self.x, self.y, self.speed_x, self.speed_y, self.angle, faction, self.radius, self.life, self.max_life,
+        ) = record_struct.unpack_from(self.buffer, self.offset)
+        self.faction = faction_table[faction & 0xFF]
+        # Trees with statuses aren't read as views.
+        self.statuses = []
+        return getattr(self, name)
+
+    def __reduce__(self):
+        return Tree, tuple(getattr(self, name) for name in LazyTree.FIELDS)
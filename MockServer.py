@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import _socket
+import math
+import os
+import random
+import struct
+import sys
+import time
+
+from model.Building import Building
+from model.BuildingType import BuildingType
+from model.Faction import Faction
+from model.Game import Game
+from model.Minion import Minion
+from model.MinionType import MinionType
+from model.Move import Move
+from model.Player import Player
+from model.PlayerContext import PlayerContext
+from model.Projectile import Projectile
+from model.ProjectileType import ProjectileType
+from model.SkillType import SkillType
+from model.Tree import Tree
+from model.Wizard import Wizard
+from model.World import World
+from RemoteProcessClient import RemoteProcessClient
+from SessionReplay import SessionReplay
+
+
+# Game rules of the default game.
+GAME_PARAMETERS = dict(
+    random_seed=0, tick_count=20000, map_size=4000.0, skills_enabled=True, raw_messages_enabled=True,
+    friendly_fire_damage_factor=0.0, building_damage_score_factor=0.25, building_elimination_score_factor=0.75,
+    minion_damage_score_factor=0.25, minion_elimination_score_factor=0.25, wizard_damage_score_factor=1.0,
+    wizard_elimination_score_factor=1.0, team_working_score_factor=0.33, victory_score=1000, score_gain_range=600.0,
+    raw_message_max_length=1024, raw_message_transmission_speed=1.0, wizard_radius=35.0, wizard_cast_range=500.0,
+    wizard_vision_range=600.0, wizard_forward_speed=4.0, wizard_backward_speed=3.0, wizard_strafe_speed=3.0,
+    wizard_base_life=100, wizard_life_growth_per_level=10, wizard_base_mana=100, wizard_mana_growth_per_level=10,
+    wizard_base_life_regeneration=0.05, wizard_life_regeneration_growth_per_level=0.005,
+    wizard_base_mana_regeneration=0.2, wizard_mana_regeneration_growth_per_level=0.02,
+    wizard_max_turn_angle=math.pi / 30.0, wizard_max_resurrection_delay_ticks=2400,
+    wizard_min_resurrection_delay_ticks=1200, wizard_action_cooldown_ticks=30, staff_cooldown_ticks=60,
+    magic_missile_cooldown_ticks=60, frost_bolt_cooldown_ticks=90, fireball_cooldown_ticks=120,
+    haste_cooldown_ticks=120, shield_cooldown_ticks=120, magic_missile_manacost=12, frost_bolt_manacost=36,
+    fireball_manacost=48, haste_manacost=48, shield_manacost=48, staff_damage=12, staff_sector=math.pi / 6.0,
+    staff_range=70.0,
+    level_up_xp_values=[50, 100, 150, 200, 250, 300, 350, 400, 450, 500, 600, 700, 800, 900, 1000, 1200, 1400, 1600,
+                        1800, 2000],
+    minion_radius=25.0, minion_vision_range=400.0, minion_speed=3.0, minion_max_turn_angle=math.pi / 30.0,
+    minion_life=100, faction_minion_appearance_interval_ticks=750, orc_woodcutter_action_cooldown_ticks=60,
+    orc_woodcutter_damage=12, orc_woodcutter_attack_sector=math.pi / 6.0, orc_woodcutter_attack_range=50.0,
+    fetish_blowdart_action_cooldown_ticks=30, fetish_blowdart_attack_range=300.0,
+    fetish_blowdart_attack_sector=math.pi / 6.0, bonus_radius=20.0, bonus_appearance_interval_ticks=2500,
+    bonus_score_amount=200, dart_radius=5.0, dart_speed=50.0, dart_direct_damage=6, magic_missile_radius=10.0,
+    magic_missile_speed=40.0, magic_missile_direct_damage=12, frost_bolt_radius=15.0, frost_bolt_speed=35.0,
+    frost_bolt_direct_damage=24, fireball_radius=20.0, fireball_speed=30.0, fireball_explosion_max_damage_range=50.0,
+    fireball_explosion_min_damage_range=100.0, fireball_explosion_max_damage=24, fireball_explosion_min_damage=12,
+    guardian_tower_radius=50.0, guardian_tower_vision_range=600.0, guardian_tower_life=1000.0,
+    guardian_tower_attack_range=600.0, guardian_tower_damage=36, guardian_tower_cooldown_ticks=240,
+    faction_base_radius=100.0, faction_base_vision_range=800.0, faction_base_life=2000.0,
+    faction_base_attack_range=800.0, faction_base_damage=48, faction_base_cooldown_ticks=240,
+    burning_duration_ticks=240, burning_summary_damage=24, empowered_duration_ticks=2400, empowered_damage_factor=1.5,
+    frozen_duration_ticks=60, hastened_duration_ticks=60, hastened_bonus_duration_factor=10.0,
+    hastened_movement_bonus_factor=0.3, hastened_rotation_bonus_factor=1.0, shielded_duration_ticks=120,
+    shielded_bonus_duration_factor=10.0, shielded_direct_damage_absorption_factor=0.25, aura_skill_range=500.0,
+    range_bonus_per_skill_level=25.0, magical_damage_bonus_per_skill_level=1, staff_damage_bonus_per_skill_level=3,
+    movement_bonus_factor_per_skill_level=0.05, magical_damage_absorption_per_skill_level=1,
+)
+
+# Academy buildings, renegade ones are mirrored.
+ACADEMY_BUILDINGS = [
+    (400.0, 3600.0, BuildingType.FACTION_BASE),
+    (50.0, 2693.3, BuildingType.GUARDIAN_TOWER),
+    (350.0, 1656.8, BuildingType.GUARDIAN_TOWER),
+    (902.6, 2768.3, BuildingType.GUARDIAN_TOWER),
+    (1929.3, 2400.0, BuildingType.GUARDIAN_TOWER),
+    (1370.7, 3650.0, BuildingType.GUARDIAN_TOWER),
+    (2312.1, 3950.0, BuildingType.GUARDIAN_TOWER),
+]
+
+# Synthetic game layout.
+TREE_COUNT = 300
+MINIONS_PER_FACTION = 24
+PROJECTILE_COUNT = 6
+
+
+class MockServer(RemoteProcessClient):
+    # Local stand-in for the game server. Plays the given player contexts to a single client at full speed, over the
+    # same binary protocol and with the same flag-100 references to units the client already has.
+
+    # Move fields after the flag.
+    MOVE_FIELDS_STRUCT = struct.Struct(RemoteProcessClient.BYTE_ORDER_FORMAT_STRING + "3db3dqb")
+
+    def __init__(self, socket):
+        super().__init__(None, None, socket)
+        # Units and players sent to the client, they are referred to by id while they stay the same.
+        self.sent_unit_by_id = {}
+        self.sent_player_by_id = {}
+
+    @staticmethod
+    def listen(host="127.0.0.1", port=31001):
+        listener = _socket.socket()
+        listener.setsockopt(_socket.SOL_SOCKET, _socket.SO_REUSEADDR, True)
+        listener.bind((host, port))
+        listener.listen(1)
+        return listener
+
+    @staticmethod
+    def accept(listener):
+        socket, _ = listener._accept()
+        socket = _socket.socket(fileno=socket)
+        socket.setsockopt(_socket.IPPROTO_TCP, _socket.TCP_NODELAY, True)
+        return MockServer(socket)
+
+    def serve(self, game: Game, player_contexts, team_size=1):
+        self.read_token_message()
+        self.read_protocol_version_message()
+        self.write_team_size_message(team_size)
+        self.write_game_context_message(game)
+
+        tick_count = 0
+        started_at = time.perf_counter()
+        for player_context in player_contexts:
+            self.write_player_context_message(player_context)
+            self.read_moves_message()
+            tick_count += 1
+        self.write_game_over_message()
+        return tick_count, time.perf_counter() - started_at
+
+    def read_token_message(self):
+        message_type = self.read_enum(RemoteProcessClient.MessageType)
+        self.ensure_message_type(message_type, RemoteProcessClient.MessageType.AUTHENTICATION_TOKEN)
+        return self.read_string()
+
+    def read_protocol_version_message(self):
+        message_type = self.read_enum(RemoteProcessClient.MessageType)
+        self.ensure_message_type(message_type, RemoteProcessClient.MessageType.PROTOCOL_VERSION)
+        return self.read_int()
+
+    def write_team_size_message(self, team_size):
+        self.write_enum(RemoteProcessClient.MessageType.TEAM_SIZE)
+        self.write_int(team_size)
+        self.flush()
+
+    def write_game_context_message(self, game: Game):
+        self.write_enum(RemoteProcessClient.MessageType.GAME_CONTEXT)
+        self.write_game(game)
+        self.flush()
+
+    def write_player_context_message(self, player_context: PlayerContext):
+        self.write_enum(RemoteProcessClient.MessageType.PLAYER_CONTEXT)
+        self.write_player_context(player_context)
+        self.flush()
+
+    def write_game_over_message(self):
+        self.write_enum(RemoteProcessClient.MessageType.GAME_OVER)
+        self.flush()
+
+    def read_moves_message(self):
+        message_type = self.read_enum(RemoteProcessClient.MessageType)
+        self.ensure_message_type(message_type, RemoteProcessClient.MessageType.MOVE)
+        return self.read_moves()
+
+    def read_moves(self):
+        move_count = self.read_int()
+        if move_count < 0:
+            return None
+
+        moves = []
+
+        for _ in range(move_count):
+            moves.append(self.read_move())
+
+        return moves
+
+    def read_move(self):
+        if not self.read_boolean():
+            return None
+
+        move = Move()
+        (
+            move.speed, move.strafe_speed, move.turn, action, move.cast_angle, move.min_cast_distance,
+            move.max_cast_distance, move.status_target_id, skill_to_learn,
+        ) = self.read_struct(MockServer.MOVE_FIELDS_STRUCT)
+        move.action = None if action < 0 else action
+        move.skill_to_learn = None if skill_to_learn < 0 else skill_to_learn
+        move.messages = self.read_messages()
+        return move
+
+    def write_reference(self, unit_by_id, unit):
+        if unit is None or unit_by_id.get(unit.id) is not unit:
+            return False
+        self.write_struct(RemoteProcessClient.BYTE_STRUCT, 100)
+        self.write_long(unit.id)
+        return True
+
+    def write_player(self, player):
+        if not self.write_reference(self.sent_player_by_id, player):
+            super().write_player(player)
+            if player is not None:
+                self.sent_player_by_id[player.id] = player
+
+    def write_players(self, players):
+        if players is not None and players is self.players:
+            # Same list as in the previous tick.
+            self.write_int(-1)
+        else:
+            super().write_players(players)
+            self.players = players
+
+    def write_minion(self, minion):
+        if not self.write_reference(self.sent_unit_by_id, minion):
+            super().write_minion(minion)
+            if minion is not None:
+                self.sent_unit_by_id[minion.id] = minion
+
+    def write_building(self, building):
+        if not self.write_reference(self.sent_unit_by_id, building):
+            super().write_building(building)
+            if building is not None:
+                self.sent_unit_by_id[building.id] = building
+
+    def write_buildings(self, buildings):
+        if buildings is not None and buildings is self.buildings:
+            self.write_int(-1)
+        else:
+            super().write_buildings(buildings)
+            self.buildings = buildings
+
+    def write_tree(self, tree):
+        if not self.write_reference(self.sent_unit_by_id, tree):
+            super().write_tree(tree)
+            if tree is not None:
+                self.sent_unit_by_id[tree.id] = tree
+
+    def write_trees(self, trees):
+        if trees is not None and trees is self.trees:
+            self.write_int(-1)
+        else:
+            super().write_trees(trees)
+            self.trees = trees
+
+    @staticmethod
+    def generate_player_contexts(game: Game, tick_count, team_size=1, seed=0):
+        # Synthetic game: wizards wander, minions walk the lanes, static units are reused while they don't change and
+        # the visible trees are the same list while they are the same trees. Our player owns the first wizards.
+        rnd = random.Random(seed)
+        map_size = game.map_size
+        players = [
+            Player(player_id, player_id == 1, "Player %d" % player_id, False, 0,
+                   Faction.ACADEMY if player_id <= 5 else Faction.RENEGADES)
+            for player_id in range(1, 11)
+        ]
+        trees = [
+            Tree(1000 + i, rnd.uniform(0.0, map_size), rnd.uniform(0.0, map_size), 0.0, 0.0, 0.0, Faction.OTHER,
+                 rnd.uniform(20.0, 50.0), 10, 10, [])
+            for i in range(TREE_COUNT)
+        ]
+        buildings = []
+        for faction in (Faction.ACADEMY, Faction.RENEGADES):
+            for x, y, building_type in ACADEMY_BUILDINGS:
+                if faction == Faction.RENEGADES:
+                    x, y = map_size - x, map_size - y
+                buildings.append(MockServer.create_building(game, 2000 + len(buildings), x, y, faction, building_type))
+        wizard_positions = [
+            (rnd.uniform(100.0, 800.0), rnd.uniform(3200.0, 3900.0)) if wizard_id <= 5 else
+            (rnd.uniform(3200.0, 3900.0), rnd.uniform(100.0, 800.0))
+            for wizard_id in range(1, 11)
+        ]
+        minions = []
+        for i in range(2 * MINIONS_PER_FACTION):
+            if rnd.random() < 0.5:
+                minion_type, damage = MinionType.ORC_WOODCUTTER, game.orc_woodcutter_damage
+                cooldown_ticks = game.orc_woodcutter_action_cooldown_ticks
+            else:
+                minion_type, damage = MinionType.FETISH_BLOWDART, game.dart_direct_damage
+                cooldown_ticks = game.fetish_blowdart_action_cooldown_ticks
+            minions.append(Minion(
+                3000 + i, rnd.uniform(0.0, map_size), rnd.uniform(0.0, map_size), 0.0, 0.0, 0.0,
+                Faction.ACADEMY if i % 2 else Faction.RENEGADES, game.minion_radius, game.minion_life,
+                game.minion_life, [], minion_type, game.minion_vision_range, damage, cooldown_ticks, 0
+            ))
+        visible_trees = []
+
+        for tick_index in range(tick_count):
+            wizards = []
+            for wizard_index, (x, y) in enumerate(wizard_positions):
+                wizard_id = wizard_index + 1
+                x = min(map_size - 50.0, max(50.0, x + rnd.uniform(-3.0, 3.0)))
+                y = min(map_size - 50.0, max(50.0, y + rnd.uniform(-3.0, 3.0)))
+                wizard_positions[wizard_index] = x, y
+                wizards.append(Wizard(
+                    wizard_id, x, y, 0.0, 0.0, rnd.uniform(-math.pi, math.pi),
+                    Faction.ACADEMY if wizard_id <= 5 else Faction.RENEGADES, game.wizard_radius, 100, 100, [],
+                    1 if wizard_id <= team_size else wizard_id, wizard_id <= team_size, 100, 100,
+                    game.wizard_vision_range, game.wizard_cast_range, 10 * tick_index, 0, [SkillType.RANGE_BONUS_PASSIVE_1],
+                    rnd.randint(0, game.wizard_action_cooldown_ticks), [0] * 7, wizard_id == 1, []
+                ))
+
+            # Most minions move, the rest are fighting and stay the same objects.
+            for minion_index, minion in enumerate(minions):
+                if rnd.random() < 0.3:
+                    continue
+                minions[minion_index] = Minion(
+                    minion.id, min(map_size, max(0.0, minion.x + rnd.uniform(-3.0, 3.0))),
+                    min(map_size, max(0.0, minion.y + rnd.uniform(-3.0, 3.0))), 0.0, 0.0, minion.angle,
+                    minion.faction, minion.radius, minion.life, minion.max_life, [], minion.type, minion.vision_range,
+                    minion.damage, minion.cooldown_ticks, rnd.randint(0, minion.cooldown_ticks)
+                )
+
+            # A tower shoots once in a while and its cooldown changes.
+            if tick_index % 60 == 0:
+                building_index = rnd.randrange(len(buildings))
+                building = buildings[building_index]
+                buildings = list(buildings)
+                buildings[building_index] = MockServer.create_building(
+                    game, building.id, building.x, building.y, building.faction, building.type,
+                    rnd.randint(0, building.cooldown_ticks)
+                )
+
+            my_wizards = wizards[:team_size]
+            new_visible_trees = [
+                tree
+                for tree in trees
+                if any(tree.get_distance_to_unit(wizard) < wizard.vision_range for wizard in my_wizards)
+            ]
+            if new_visible_trees != visible_trees:
+                visible_trees = new_visible_trees
+
+            projectiles = [
+                Projectile(4000 + tick_index * PROJECTILE_COUNT + i, rnd.uniform(0.0, map_size),
+                           rnd.uniform(0.0, map_size), 40.0, 0.0, 0.0, Faction.ACADEMY, game.magic_missile_radius,
+                           ProjectileType.MAGIC_MISSILE, 1, 1)
+                for i in range(PROJECTILE_COUNT)
+            ]
+            world = World(
+                tick_index, game.tick_count, map_size, map_size, players, wizards, list(minions), projectiles, [],
+                buildings, visible_trees
+            )
+            yield PlayerContext(my_wizards, world)
+
+    @staticmethod
+    def create_building(game: Game, building_id, x, y, faction, building_type, remaining_action_cooldown_ticks=0):
+        if building_type == BuildingType.FACTION_BASE:
+            return Building(
+                building_id, x, y, 0.0, 0.0, 0.0, faction, game.faction_base_radius, int(game.faction_base_life),
+                int(game.faction_base_life), [], building_type, game.faction_base_vision_range,
+                game.faction_base_attack_range, game.faction_base_damage, game.faction_base_cooldown_ticks,
+                remaining_action_cooldown_ticks
+            )
+        return Building(
+            building_id, x, y, 0.0, 0.0, 0.0, faction, game.guardian_tower_radius, int(game.guardian_tower_life),
+            int(game.guardian_tower_life), [], building_type, game.guardian_tower_vision_range,
+            game.guardian_tower_attack_range, game.guardian_tower_damage, game.guardian_tower_cooldown_ticks,
+            remaining_action_cooldown_ticks
+        )
+
+
+if __name__ == "__main__":
+    # Serve a synthetic game or a captured session to one client: MockServer.py [port] [tick_count] [team_size] or
+    # MockServer.py port capture_path.
+    port = int(sys.argv[1]) if sys.argv.__len__() > 1 else 31001
+    source = sys.argv[2] if sys.argv.__len__() > 2 else "2000"
+
+    if os.path.isfile(source):
+        team_size, game, player_contexts = SessionReplay.read_session(source)
+    else:
+        team_size = int(sys.argv[3]) if sys.argv.__len__() > 3 else 1
+        game = Game(**GAME_PARAMETERS)
+        player_contexts = MockServer.generate_player_contexts(game, int(source), team_size)
+    # Prepared upfront, so that only the protocol and the client are measured.
+    player_contexts = list(player_contexts)
+
+    listener = MockServer.listen(port=port)
+    server = MockServer.accept(listener)
+    listener.close()
+    try:
+        served_tick_count, seconds = server.serve(game, player_contexts, team_size)
+    finally:
+        server.close()
+    print("%d ticks in %.2f s, %.1f ticks/s" % (served_tick_count, seconds, served_tick_count / seconds))
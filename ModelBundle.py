@@ -0,0 +1,59 @@
+import os
+import sys
+
+from importlib.machinery import ModuleSpec
+
+from StartupCache import StartupCache
+
+
+class ModelBundle:
+    # Compiled model modules kept together in one startup cache file. Installed as an import hook, it serves the model
+    # package without looking for, checking and reading each module file on its own.
+    PACKAGE = "model"
+
+    def __init__(self, code_by_name, directory):
+        self.code_by_name = code_by_name
+        self.directory = directory
+
+    def find_spec(self, fullname, path=None, target=None):
+        package, _, name = fullname.partition(".")
+        code = self.code_by_name.get(name or "__init__") if package == ModelBundle.PACKAGE else None
+        if code is None:
+            return None
+        spec = ModuleSpec(fullname, self, origin=code.co_filename, is_package=not name)
+        spec.has_location = True
+        if not name:
+            spec.submodule_search_locations = [self.directory]
+        return spec
+
+    def create_module(self, spec):
+        # Default module creation.
+        return None
+
+    def exec_module(self, module):
+        exec(self.code_by_name[module.__name__.partition(".")[2] or "__init__"], module.__dict__)
+
+    @staticmethod
+    def install():
+        directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), ModelBundle.PACKAGE)
+        file_names = sorted(file_name for file_name in os.listdir(directory) if file_name.endswith(".py"))
+        # The bundle is stale when any of the sources has changed, checked the way .pyc files are.
+        key = []
+        for file_name in file_names:
+            stat = os.stat(os.path.join(directory, file_name))
+            key.append((file_name, stat.st_mtime_ns, stat.st_size))
+        code_by_name = StartupCache.load(
+            ModelBundle.PACKAGE, key, lambda: ModelBundle.compile_sources(directory, file_names),
+        )
+        bundle = ModelBundle(code_by_name, directory)
+        sys.meta_path.insert(0, bundle)
+        return bundle
+
+    @staticmethod
+    def compile_sources(directory, file_names):
+        code_by_name = {}
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            with open(path, "rb") as file:
+                code_by_name[file_name[:-len(".py")]] = compile(file.read(), path, "exec", dont_inherit=True)
+        return code_by_name
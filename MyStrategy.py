@@ -1,24 +1,39 @@
 #!/usr/bin/env python3
 # coding: utf-8
 
-import itertools
+import heapq
 import math
 import random
 import time
 
 from typing import Set, Tuple
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from model.ActionType import ActionType
 from model.CircularUnit import CircularUnit
 from model.Faction import Faction
 from model.Game import Game
 from model.LivingUnit import LivingUnit
 from model.Minion import Minion
-from model.MinionType import MinionType
 from model.Move import Move
 from model.SkillType import SkillType
 from model.Wizard import Wizard
 from model.World import World
+from Deadline import Deadline
+from GeometryCache import GeometryCache
+from Navigation import Navigation
+from Routing import Routing
+from Simulator import Simulator
+from SimulatorCache import SimulatorCache
+from SpatialIndex import SpatialIndex
+from StartupCache import StartupCache
+from TargetRanking import TargetRanking
+from ThreatMap import ThreatMap
+from WorldArrays import WorldArrays
 
 
 MY_BASE_X, MY_BASE_Y = 200.0, 3800.0
@@ -136,27 +151,88 @@ KEY_TILES = [
 
 DIRECT_MOVE_DISTANCE = 600.0
 
-KEY_ADJACENT = {
-    i: [
-        j
-        for j, (jx, jy) in enumerate(KEY_TILES)
-        if i != j and math.hypot(ix - jx, iy - jy) < DIRECT_MOVE_DISTANCE
-    ]
-    for i, (ix, iy) in enumerate(KEY_TILES)
-}
+
+def build_key_routes():
+    adjacent = {
+        i: [
+            j
+            for j, (jx, jy) in enumerate(KEY_TILES)
+            if i != j and math.hypot(ix - jx, iy - jy) < DIRECT_MOVE_DISTANCE
+        ]
+        for i, (ix, iy) in enumerate(KEY_TILES)
+    }
+    return adjacent, Routing(KEY_TILES, adjacent).build_all()
+
+
+# Key tile graph and shortest routes between all key tiles, built once and then loaded from the startup cache.
+KEY_ADJACENT, KEY_NEXT_HOPS = StartupCache.load(
+    "key_routes", (tuple(KEY_TILES), DIRECT_MOVE_DISTANCE), build_key_routes,
+)
+KEY_ROUTING = Routing(KEY_TILES, KEY_ADJACENT, next_hops_by_destination=KEY_NEXT_HOPS)
+
+# Fine-grained paths around trees, buildings and enemies, shared by the team.
+NAVIGATION = Navigation()
+
+# Distances and angles from the acting wizard, see GeometryCache.
+GEOMETRY = GeometryCache()
+
+# Forward model of the current tick, see SimulatorCache.
+SIMULATOR = SimulatorCache()
+
+# Moves tried to dodge projectiles: running at full speed in each direction, the server cuts them to the speed limits.
+DODGE_HEADING_COUNT = 16
+DODGE_MOVES = [
+    (10.0 * math.cos(2.0 * i * math.pi / DODGE_HEADING_COUNT), 10.0 * math.sin(2.0 * i * math.pi / DODGE_HEADING_COUNT))
+    for i in range(DODGE_HEADING_COUNT)
+]
+
+# Candidate steps of collision avoidance, a step of each length in each heading. Longer steps are preferred.
+STEP_HEADING_COUNT = 72
+STEP_LENGTHS = (4.0, 3.0, 2.0)
+# Clearance kept between a wizard at a step and other units.
+STEP_SPAN = 4.0
+STEP_OFFSETS = [
+    [(length * math.cos(angle), length * math.sin(angle)) for angle in (
+        2.0 * i * math.pi / STEP_HEADING_COUNT for i in range(STEP_HEADING_COUNT)
+    )]
+    for length in STEP_LENGTHS
+]
+if numpy is not None:
+    # Step length by heading.
+    STEP_OFFSETS_X = numpy.array([[offset_x for offset_x, _ in offsets] for offsets in STEP_OFFSETS])
+    STEP_OFFSETS_Y = numpy.array([[offset_y for _, offset_y in offsets] for offsets in STEP_OFFSETS])
 
 
 class MyStrategy:
 
-    def __init__(self):
+    def __init__(self, threat_map: ThreatMap = None, move_budget: float = None):
         random.seed(time.time())
         self.pick_up_bonus = None
+        # The runner shares the map between the team.
+        self.threat_map = threat_map if threat_map is not None else ThreatMap()
+        # Seconds a move may take, no limit if None.
+        self.deadline = Deadline(move_budget)
+        # Enemies ranked for this wizard, kept between ticks.
+        self.targets = TargetRanking()
 
-    # noinspection PyMethodMayBeStatic
     def move(self, me: Wizard, world: World, game: Game, move: Move):
+        self.choose_move(me, world, game, move)
+        # Step aside if a projectile is going to hit us.
+        MyStrategy.dodge_projectiles(me, world, game, move, self.deadline)
+
+    # noinspection PyMethodMayBeStatic
+    def choose_move(self, me: Wizard, world: World, game: Game, move: Move):
         # First, initialize some common things.
         attack_faction = self.get_attack_faction(me.faction)
         skills = set(me.skills)
+        GEOMETRY.update(me, world)
+        self.threat_map.update(world, game, attack_faction, MyStrategy.get_arrays(world))
+        self.targets.update(world, game, attack_faction)
+        # The budget is for this wizard's decisions. Updates above are mostly done once per tick by whichever wizard
+        # moves first, they'd eat its budget alone.
+        deadline = self.deadline
+        deadline.start()
+        max_life_risk = me.life - 0.25 * me.max_life
 
         # Learn some skill.
         move.skill_to_learn = self.skill_to_learn(skills)
@@ -184,34 +260,49 @@ class MyStrategy:
             ):
                 self.pick_up_bonus = None
             else:
-                self.move_by_tiles_to(me, world, game, move, x, y)
+                self.move_by_tiles_to(me, world, game, move, x, y, self.threat_map, deadline)
             return
 
         # Check if I'm healthy.
-        if self.is_in_danger(me, world, game, me.x, me.y, attack_faction):
+        if self.threat_map.is_in_danger(me.x, me.y, max_life_risk):
             # Retreat to the nearest safe tile.
-            x, y = min((
-                (x, y)
-                for x, y in KEY_TILES
-                if not self.is_in_danger(me, world, game, x, y, attack_faction)
-            ), key=(lambda point: me.get_distance_to(*point)))
-            self.move_by_tiles_to(me, world, game, move, x, y)
+            x, y = self.get_retreat_tile(me, max_life_risk, deadline)
+            self.move_by_tiles_to(me, world, game, move, x, y, self.threat_map, deadline)
             MyStrategy.attack_nearest_enemy(me, world, game, move, skills, attack_faction)
             return
 
         # Else try to attack the best target.
-        if MyStrategy.attack_best_target(me, world, game, move, skills, attack_faction):
+        if MyStrategy.attack_best_target(
+            me, world, game, move, skills, attack_faction, self.targets, self.threat_map, deadline,
+        ):
             return
 
         # Quick and dirty fix to avoid being stuck near the base.
         if me.x < 400.0 and me.y > 3600.0:
-            move.turn = me.get_angle_to(*self.move_by_tiles_to(me, world, game, move, 200.0, 200.0))
+            x, y = self.move_by_tiles_to(me, world, game, move, 200.0, 200.0, self.threat_map, deadline)
+            move.turn = me.get_angle_to(x, y)
             return
 
         # Nothing to do. Just go to enemy base.
-        x, y = self.move_by_tiles_to(me, world, game, move, ATTACK_BASE_X, ATTACK_BASE_Y)
+        x, y = self.move_by_tiles_to(me, world, game, move, ATTACK_BASE_X, ATTACK_BASE_Y, self.threat_map, deadline)
         move.turn = me.get_angle_to(x, y)
 
+    def get_retreat_tile(self, me: Wizard, max_life_risk: float, deadline: Deadline) -> Tuple[float, float]:
+        with deadline.stage("retreat") as stage:
+            # The first safe tile is the nearest one.
+            tiles = sorted(KEY_TILES, key=(lambda point: me.get_distance_to(*point)))
+            # Until then the least dangerous one is the best.
+            best_tile, min_damage = tiles[0], float("+inf")
+            for i, (x, y) in enumerate(tiles):
+                if stage.is_expired(i, len(tiles)):
+                    break
+                if not self.threat_map.is_in_danger(x, y, max_life_risk):
+                    return x, y
+                damage = self.threat_map.get_damage(x, y)
+                if damage < min_damage:
+                    best_tile, min_damage = (x, y), damage
+            return best_tile
+
     @staticmethod
     def skill_to_learn(skills: Set[SkillType]):
         for skill in SKILL_ORDER:
@@ -224,59 +315,44 @@ class MyStrategy:
         return Faction.ACADEMY if faction == Faction.RENEGADES else Faction.RENEGADES
 
     @staticmethod
-    def is_in_danger(me: Wizard, world: World, game: Game, x: float, y: float, attack_faction) -> bool:
-        max_life_risk = me.life - 0.25 * me.max_life
-        span = 2.0 * me.radius
-        for wizard in world.wizards:
-            if wizard.faction != attack_faction:
-                continue
-            if wizard.get_distance_to(x, y) > wizard.cast_range + span:
-                continue
-            if wizard.remaining_action_cooldown_ticks > 0.5 * game.wizard_action_cooldown_ticks:
-                continue
-            if max_life_risk < 0.0:
-                return True
-            if SkillType.FIREBALL in wizard.skills or SkillType.FROST_BOLT in wizard.skills:
-                return True
-            if max_life_risk < max(game.staff_damage, game.magic_missile_direct_damage, game.frost_bolt_direct_damage):
-                return True
-        for minion in world.minions:
-            distance = minion.get_distance_to(x, y)
-            if minion.faction != attack_faction:
-                continue
-            if minion.type == MinionType.FETISH_BLOWDART and distance < game.fetish_blowdart_attack_range + span:
-                return True
-            if minion.type == MinionType.ORC_WOODCUTTER and distance < game.orc_woodcutter_attack_range + span:
-                return True
-        for building in world.buildings:
-            if building.faction != attack_faction:
-                continue
-            if building.get_distance_to(x, y) > game.guardian_tower_attack_range + span:
-                continue
-            if max_life_risk < 0.0:
-                return True
-            if max_life_risk > game.guardian_tower_damage:
-                continue
-            if building.remaining_action_cooldown_ticks > 0.5 * building.cooldown_ticks:
-                continue
-            return True
-        return False
+    def get_spatial_index(world: World) -> SpatialIndex:
+        # The client shares one index between all wizards of the team, other worlds get their own.
+        spatial_index = world.get_spatial_index()
+        if spatial_index is None:
+            spatial_index = world.spatial_index = SpatialIndex(world)
+        return spatial_index
+
+    @staticmethod
+    def get_arrays(world: World) -> WorldArrays:
+        # The client shares the arrays between all wizards of the team, other worlds get their own. None without numpy.
+        arrays = world.get_arrays()
+        if arrays is None and WorldArrays.is_available():
+            arrays = world.arrays = WorldArrays(world)
+        return arrays
 
     @staticmethod
-    def move_by_tiles_to(me: Wizard, world: World, game: Game, move: Move, x: float, y: float) -> Tuple[float, float]:
+    def get_simulator(world: World, game: Game) -> Simulator:
+        # Shared by all wizards of the team.
+        return SIMULATOR.get(world, MyStrategy.get_arrays(world), game)
+
+    @staticmethod
+    def move_by_tiles_to(
+        me: Wizard, world: World, game: Game, move: Move, x: float, y: float, threat_map: ThreatMap,
+        deadline: Deadline,
+    ) -> Tuple[float, float]:
         # We're already there?
         if me.get_distance_to(x, y) < 1.0:
             # Reached the destination.
             return x, y
         if me.get_distance_to(x, y) < DIRECT_MOVE_DISTANCE:
             # We can just move there.
-            MyStrategy.move_to(me, world, game, move, x, y)
+            MyStrategy.move_to(me, world, game, move, x, y, threat_map, deadline)
             return x, y
         # Find the nearest tile.
         my_index, (my_tile_x, my_tile_y) = min(enumerate(KEY_TILES), key=(lambda tile: me.get_distance_to(*tile[1])))
         if not MyStrategy.is_in_tile(my_tile_x, my_tile_y, me.x, me.y):
             # We're away. Go to this tile.
-            MyStrategy.move_to(me, world, game, move, my_tile_x, my_tile_y)
+            MyStrategy.move_to(me, world, game, move, my_tile_x, my_tile_y, threat_map, deadline)
             return my_tile_x, my_tile_y
         # Find the destination tile.
         destination_index = next(
@@ -284,28 +360,25 @@ class MyStrategy:
             if MyStrategy.is_in_tile(tile_x, tile_y, x, y)
         )
         # Find route between tiles.
-        bfs_queue = [destination_index]
-        bfs_visited = {destination_index}
-        while bfs_queue:
-            current_index = bfs_queue.pop(0)
-            for previous_index in KEY_ADJACENT[current_index]:
-                if previous_index == my_index:
-                    move_x, move_y = KEY_TILES[current_index]
-                    MyStrategy.move_to(me, world, game, move, move_x, move_y)
-                    return move_x, move_y
-                if previous_index not in bfs_visited:
-                    bfs_queue.append(previous_index)
-                    bfs_visited.add(current_index)
-        print("Failed to find route from %s, %s to %s, %s" % (me.x, me.y, x, y))
-        return x, y
+        next_index = KEY_ROUTING.get_next_hop(my_index, destination_index)
+        if next_index is None:
+            print("Failed to find route from %s, %s to %s, %s" % (me.x, me.y, x, y))
+            return x, y
+        move_x, move_y = KEY_TILES[next_index]
+        MyStrategy.move_to(me, world, game, move, move_x, move_y, threat_map, deadline)
+        return move_x, move_y
 
     @staticmethod
     def is_in_tile(tile_x: float, tile_y: float, x: float, y: float) -> bool:
         return tile_x - TILE_SPAN < x < tile_x + TILE_SPAN and tile_y - TILE_SPAN < y < tile_y + TILE_SPAN
 
     @staticmethod
-    def move_to(me: Wizard, world: World, game: Game, move: Move, x: float, y: float):
-        x, y = MyStrategy.avoid_collisions(me, world, x, y)
+    def move_to(
+        me: Wizard, world: World, game: Game, move: Move, x: float, y: float, threat_map: ThreatMap,
+        deadline: Deadline,
+    ):
+        x, y = NAVIGATION.get_waypoint(me, world, game, x, y, threat_map, deadline)
+        x, y = MyStrategy.avoid_collisions(me, world, x, y, deadline)
         direction_x, direction_y = x - me.x, y - me.y
         # Normalize the destination vector.
         distance = math.sqrt(direction_x * direction_x + direction_y * direction_y)
@@ -329,72 +402,108 @@ class MyStrategy:
             move.strafe_speed = strafe_speed * max_speed
 
     @staticmethod
-    def avoid_collisions(me: Wizard, world: World, x: float, y: float) -> Tuple[float, float]:
-        # Units to check for collisions against.
-        units = [
-            unit
-            for unit in itertools.chain(world.buildings, world.minions, world.wizards, world.trees)
-            if unit.id != me.id
-        ]
-        # Let's do grid search!
-        new_x, new_y, min_distance = x, y, float("+inf")
-        n, r, span = 40, 4.0, 4.0
-        for i in range(n):
-            angle = 2 * i * math.pi / n
-            test_x, test_y = me.x + r * math.cos(angle), me.y + r * math.sin(angle)
-            # Check for collisions in test point.
-            if any(math.hypot(unit.x - test_x, unit.y - test_y) < me.radius + unit.radius + span for unit in units):
-                continue
-            # Check if we found a better distance.
-            distance = math.hypot(x - test_x, y - test_y)
-            if distance < min_distance:
-                new_x, new_y, min_distance = test_x, test_y, distance
-        # Return new destination.
-        return new_x, new_y
+    def avoid_collisions(me: Wizard, world: World, x: float, y: float, deadline: Deadline) -> Tuple[float, float]:
+        with deadline.stage("collisions") as stage:
+            arrays = MyStrategy.get_arrays(world)
+            if arrays is not None:
+                return MyStrategy.find_free_step(me, arrays, x, y)
+            # Units to check for collisions against, only those which may touch any of the steps.
+            units = [
+                unit
+                for unit in MyStrategy.get_spatial_index(world).get_units_touching(
+                    me.x, me.y, STEP_LENGTHS[0] + me.radius + STEP_SPAN,
+                )
+                if unit.id != me.id
+            ]
+            # Let's do grid search! Steps closer to the destination go first, so the first free one is the best.
+            checked_count, step_count = 0, len(STEP_LENGTHS) * STEP_HEADING_COUNT
+            for offsets in STEP_OFFSETS:
+                steps = sorted(
+                    (math.hypot(x - me.x - offset_x, y - me.y - offset_y), me.x + offset_x, me.y + offset_y)
+                    for offset_x, offset_y in offsets
+                )
+                for _, step_x, step_y in steps:
+                    if stage.is_expired(checked_count, step_count):
+                        return x, y
+                    checked_count += 1
+                    # Check for collisions in the step.
+                    if not any(
+                        math.hypot(unit.x - step_x, unit.y - step_y) < me.radius + unit.radius + STEP_SPAN
+                        for unit in units
+                    ):
+                        return step_x, step_y
+            # Nowhere to go, keep the destination.
+            return x, y
 
     @staticmethod
-    def attack_best_target(me: Wizard, world: World, game: Game, move: Move, skills: Set, attack_faction):
-        targets = [
-            unit
-            for unit in world.wizards
-            if unit.faction == attack_faction and me.get_distance_to_unit(unit) < me.vision_range
-        ]
-        if targets:
-            # Try to attack the weakest wizard.
-            target = min(targets, key=(lambda unit: unit.life))
-            if MyStrategy.attack(me, game, move, skills, target, True):
-                return True
-            # Try to attack the nearest wizard.
-            target = min(targets, key=(lambda unit: me.get_distance_to_unit(unit)))
-            if MyStrategy.attack(me, game, move, skills, target, True):
-                return True
-            # Chase for it.
-            MyStrategy.move_to(me, world, game, move, target.x, target.y)
+    def find_free_step(me: Wizard, arrays: WorldArrays, x: float, y: float) -> Tuple[float, float]:
+        # All the steps at once: the longest free one, the closest to the destination of them.
+        steps_x, steps_y = STEP_OFFSETS_X + me.x, STEP_OFFSETS_Y + me.y
+        # Units to check for collisions against, only those near enough to touch any of the steps.
+        min_distances = me.radius + arrays.obstacle_radius + STEP_SPAN
+        reach = STEP_LENGTHS[0] + min_distances
+        is_near = numpy.abs(arrays.obstacle_x - me.x) < reach
+        is_near &= numpy.abs(arrays.obstacle_y - me.y) < reach
+        is_near &= arrays.obstacle_ids != me.id
+        if is_near.any():
+            units_x, units_y = arrays.obstacle_x[is_near], arrays.obstacle_y[is_near]
+            min_distances = min_distances[is_near]
+            # Step × unit distances.
+            distances = numpy.hypot(steps_x[..., None] - units_x, steps_y[..., None] - units_y)
+            is_free = (distances >= min_distances).all(axis=-1)
+        else:
+            is_free = numpy.ones(steps_x.shape, dtype=bool)
+        free_lengths = is_free.any(axis=1)
+        if not free_lengths.any():
+            # Nowhere to go, keep the destination.
+            return x, y
+        length_index = int(free_lengths.argmax())
+        destination_distances = numpy.hypot(x - steps_x[length_index], y - steps_y[length_index])
+        destination_distances[~is_free[length_index]] = numpy.inf
+        heading_index = int(destination_distances.argmin())
+        return float(steps_x[length_index, heading_index]), float(steps_y[length_index, heading_index])
+
+    @staticmethod
+    def attack_best_target(
+        me: Wizard, world: World, game: Game, move: Move, skills: Set, attack_faction, targets: TargetRanking,
+        threat_map: ThreatMap, deadline: Deadline,
+    ):
+        with deadline.stage("targets") as stage:
+            return MyStrategy.attack_best_target_until(
+                me, world, game, move, skills, attack_faction, targets, threat_map, deadline, stage,
+            )
+
+    @staticmethod
+    def attack_best_target_until(
+        me: Wizard, world: World, game: Game, move: Move, skills: Set, attack_faction, targets: TargetRanking,
+        threat_map: ThreatMap, deadline: Deadline, stage: Deadline.Stage,
+    ):
+        # Try to attack wizards, the most useful first.
+        nearest = targets.get_nearest_target(me, me.vision_range, (SpatialIndex.WIZARDS,))
+        if nearest is not None:
+            for target in targets.get_targets(me, me.vision_range, (SpatialIndex.WIZARDS,)):
+                if MyStrategy.attack(me, world, game, move, skills, target, True):
+                    return True
+            # Chase for the nearest one.
+            MyStrategy.move_to(me, world, game, move, nearest.x, nearest.y, threat_map, deadline)
             return True
 
-        # Else try to attack an enemy building.
-        targets = [
-            unit
-            for unit in world.buildings
-            if unit.faction == attack_faction and me.get_distance_to_unit(unit) < me.vision_range
-        ]
-        if targets:
-            target = min(targets, key=(lambda unit: me.get_distance_to_unit(unit)))
-            if MyStrategy.attack(me, game, move, skills, target, True):
+        # Else try to attack the nearest enemy building.
+        if stage.is_expired(1, 3):
+            return False
+        nearest = targets.get_nearest_target(me, me.vision_range, (SpatialIndex.BUILDINGS,))
+        if nearest is not None:
+            if MyStrategy.attack(me, world, game, move, skills, nearest, True):
                 return True
             # Move closer to the building.
-            MyStrategy.move_to(me, world, game, move, target.x, target.y)
+            MyStrategy.move_to(me, world, game, move, nearest.x, nearest.y, threat_map, deadline)
             return True
 
-        # Else try to attack an enemy minion.
-        targets = [
-            unit
-            for unit in world.minions
-            if unit.faction == attack_faction and me.get_distance_to_unit(unit) < me.cast_range
-        ]
-        if targets:
-            target = min(targets, key=(lambda unit: unit.life))
-            if MyStrategy.attack(me, game, move, skills, target, False):
+        # Else try to attack enemy minions, the most useful first.
+        if stage.is_expired(2, 3):
+            return False
+        for target in targets.get_targets(me, me.cast_range, (SpatialIndex.MINIONS,)):
+            if MyStrategy.attack(me, world, game, move, skills, target, False):
                 return True
 
         # Couldn't attack anyone.
@@ -402,36 +511,90 @@ class MyStrategy:
 
     @staticmethod
     def attack_nearest_enemy(me: Wizard, world: World, game: Game, move: Move, skills: Set, attack_faction):
-        targets = sorted((
-            unit
-            for unit in itertools.chain(world.wizards, world.minions, world.buildings)
-            if unit.faction == attack_faction
-        ), key=(lambda unit: me.get_distance_to_unit(unit)))
-        for target in targets:
-            if MyStrategy.attack(me, game, move, skills, target, not isinstance(target, Minion)):
+        # Nothing can be attacked beyond the cast range. Nearest first, the heap is only popped until a target is
+        # attacked. Index keeps the order of equally distant units.
+        arrays = MyStrategy.get_arrays(world)
+        if arrays is not None:
+            targets = []
+            for units in (arrays.wizards, arrays.minions, arrays.buildings):
+                distances = units.get_distances_to(me.x, me.y)
+                indexes = numpy.flatnonzero((distances < me.cast_range + 1.0) & (units.faction == attack_faction))
+                for index, distance in zip(indexes.tolist(), distances[indexes].tolist()):
+                    targets.append((distance, len(targets), units.units[index]))
+        else:
+            targets = [
+                (GEOMETRY.get_distance_to_unit(me, unit), index, unit)
+                for index, unit in enumerate(MyStrategy.get_spatial_index(world).get_units_near(
+                    me.x, me.y, me.cast_range + 1.0,
+                    (SpatialIndex.WIZARDS, SpatialIndex.MINIONS, SpatialIndex.BUILDINGS),
+                ))
+                if unit.faction == attack_faction
+            ]
+        heapq.heapify(targets)
+        while targets:
+            _, _, target = heapq.heappop(targets)
+            if MyStrategy.attack(me, world, game, move, skills, target, not isinstance(target, Minion)):
                 return True
         return False
 
     @staticmethod
-    def attack(me: Wizard, game: Game, move: Move, skills: Set, unit: LivingUnit, allow_fireball: bool):
+    def attack(me: Wizard, world: World, game: Game, move: Move, skills: Set, unit: LivingUnit, allow_fireball: bool):
         action_type, min_cast_distance = MyStrategy.get_action(me, game, skills, unit, allow_fireball)
         if action_type == ActionType.NONE:
             return False
         # We can cast something.
         is_oriented, cast_angle = MyStrategy.is_oriented_to_unit(me, game, unit)
         if is_oriented:
+            if not MyStrategy.is_hitting(me, world, game, action_type, cast_angle, unit):
+                # Something is in the way, don't waste mana.
+                return False
             # Attack!
             move.cast_angle = cast_angle
             move.action = action_type
             move.min_cast_distance = min_cast_distance
             return True
         # Turn around to the enemy.
-        move.turn = me.get_angle_to_unit(unit)
+        move.turn = GEOMETRY.get_angle_to_unit(me, unit)
         return True
 
+    @staticmethod
+    def is_hitting(me: Wizard, world: World, game: Game, action_type, cast_angle: float, unit: LivingUnit) -> bool:
+        if action_type == ActionType.STAFF or not Simulator.is_available():
+            return True
+        if me.remaining_action_cooldown_ticks > 0 or me.remaining_cooldown_ticks_by_action[action_type] > 0:
+            # The cast is ignored anyway.
+            return True
+        simulator = MyStrategy.get_simulator(world, game)
+        return bool(simulator.get_cast_hits(me, [me.angle + cast_angle], action_type, unit)[0])
+
+    @staticmethod
+    def dodge_projectiles(me: Wizard, world: World, game: Game, move: Move, deadline: Deadline):
+        if not world.projectiles or not Simulator.is_available():
+            return
+        with deadline.stage("dodge"):
+            # The planned move goes first, so it's kept unless something is better. Then standing still.
+            moves = [(move.speed, move.strafe_speed), (0.0, 0.0)] + DODGE_MOVES
+            speeds_x, speeds_y = zip(*(
+                MyStrategy.get_velocity(me, game, speed, strafe_speed) for speed, strafe_speed in moves
+            ))
+            damages = MyStrategy.get_simulator(world, game).get_damage(me, speeds_x, speeds_y)
+            best_index = int(damages.argmin())
+            if damages[best_index] < damages[0]:
+                move.speed, move.strafe_speed = moves[best_index]
+
+    @staticmethod
+    def get_velocity(me: Wizard, game: Game, speed: float, strafe_speed: float) -> Tuple[float, float]:
+        # The server scales a move down to the ellipse of the maximum speeds. Skill and status bonuses are ignored.
+        max_speed = game.wizard_forward_speed if speed >= 0.0 else game.wizard_backward_speed
+        ratio = math.hypot(speed / max_speed, strafe_speed / game.wizard_strafe_speed)
+        if ratio > 1.0:
+            speed, strafe_speed = speed / ratio, strafe_speed / ratio
+        turn_x, turn_y = math.cos(me.angle), math.sin(me.angle)
+        return speed * turn_x - strafe_speed * turn_y, speed * turn_y + strafe_speed * turn_x
+
     @staticmethod
     def get_action(me: Wizard, game: Game, skills: Set[SkillType], unit: LivingUnit, allow_fireball: bool) -> (ActionType, float):
-        distance_to_unit = me.get_distance_to_unit(unit)
+        distance_to_unit = GEOMETRY.get_distance_to_unit(me, unit)
         min_cast_distance = distance_to_unit - unit.radius
         if distance_to_unit < game.staff_range:
             return ActionType.STAFF, min_cast_distance
@@ -457,8 +620,8 @@ class MyStrategy:
 
     @staticmethod
     def is_oriented_to_unit(me: Wizard, game: Game, unit: CircularUnit) -> (bool, float):
-        angle_to_unit = me.get_angle_to_unit(unit)
-        cast_angle = abs(angle_to_unit) - math.atan(unit.radius / me.get_distance_to_unit(unit))
+        angle_to_unit = GEOMETRY.get_angle_to_unit(me, unit)
+        cast_angle = abs(angle_to_unit) - math.atan(unit.radius / GEOMETRY.get_distance_to_unit(me, unit))
         if cast_angle < 0.0:
             # We can attack.
             return True, 0.0
@@ -0,0 +1,202 @@
+import heapq
+import math
+import time
+
+from model.Game import Game
+from model.Wizard import Wizard
+from model.World import World
+from Deadline import Deadline
+from Grid import Grid
+from ThreatMap import ThreatMap
+
+
+class Navigation(Grid):
+    # A* planner over a fine grid. Trees and buildings are rasterized into blocked cells, inflated by the wizard
+    # radius. Cells within reach of enemies cost more, so that paths go around danger when there is a way. Enemy reach
+    # is read from the team's ThreatMap, the grids are the same.
+    # A search stops after expanding this many nodes and returns the path to the node closest to the goal.
+    MAX_EXPANDED_NODES = 3000
+    # A path is reused while it's valid, but not longer than this.
+    REPLAN_INTERVAL_TICKS = 10
+    # Extra cost of stepping into a cell within enemy reach.
+    THREAT_COST = 8.0
+    # Steer to the farthest path cell in line of sight, looking not further than this.
+    LOOKAHEAD_CELLS = 8
+    # Number of expanded nodes between deadline checks.
+    DEADLINE_CHECK_INTERVAL = 64
+
+    NEIGHBOURS = (
+        (1, 0, 1.0), (-1, 0, 1.0), (0, 1, 1.0), (0, -1, 1.0),
+        (1, 1, math.sqrt(2.0)), (1, -1, math.sqrt(2.0)), (-1, 1, math.sqrt(2.0)), (-1, -1, math.sqrt(2.0)),
+    )
+
+    def __init__(self, map_size=4000.0):
+        super().__init__(map_size)
+        self.blocked = bytearray(self.size * self.size)
+        # Threat counts by cell, see ThreatMap.ANY.
+        self.threat = [0] * (self.size * self.size)
+        # Lists the grid was built from, and id, position and radius of their units.
+        self.obstacle_lists = (None, None)
+        self.geometries = (None, None)
+        # Goal cell, path cells and the tick it was planned at, by wizard id.
+        self.path_by_wizard_id = {}
+        # Time spent in searches and the nodes they expanded, totals of the game. See LatencyMonitor.end_search.
+        self.search_seconds = 0.0
+        self.expanded_node_count = 0
+
+    def get_waypoint(
+        self, me: Wizard, world: World, game: Game, x: float, y: float, threat_map: ThreatMap,
+        deadline: Deadline = None,
+    ):
+        if threat_map.size != self.size:
+            raise ValueError("Threat map is %d cells wide, expected %d." % (threat_map.size, self.size))
+        self.update_obstacles(world, game)
+        self.threat = threat_map.counts[ThreatMap.ANY]
+
+        start, goal = self.get_index(me.x, me.y), self.get_index(x, y)
+        if start == goal or (self.is_line_free(me.x, me.y, x, y) and not self.is_line_threatened(me.x, me.y, x, y)):
+            # Nothing in the way.
+            waypoint = x, y
+        else:
+            path = self.get_path(me.id, start, goal, world.tick_index, deadline)
+            waypoint = self.get_lookahead_point(me.x, me.y, path, x, y)
+        return waypoint
+
+    def update_obstacles(self, world: World, game: Game):
+        obstacle_lists = (world.trees, world.buildings)
+        if all(units is previous_units for units, previous_units in zip(obstacle_lists, self.obstacle_lists)):
+            return
+        # Towers are sent anew while their cooldown counts down, the grid only depends on where the obstacles are.
+        geometries = tuple(
+            geometry if units is previous_units else Navigation.get_geometry(units)
+            for units, previous_units, geometry in zip(obstacle_lists, self.obstacle_lists, self.geometries)
+        )
+        self.obstacle_lists = obstacle_lists
+        if geometries == self.geometries:
+            return
+        self.geometries = geometries
+        blocked = bytearray(self.size * self.size)
+        for geometry in geometries:
+            for _, x, y, radius in geometry:
+                for start, end in self.get_disk_spans(x, y, radius + game.wizard_radius):
+                    blocked[start:end] = b"\x01" * (end - start)
+        if blocked != self.blocked:
+            self.blocked = blocked
+            # Obstacles changed, so may the paths.
+            self.path_by_wizard_id.clear()
+
+    @staticmethod
+    def get_geometry(units):
+        return frozenset((unit.id, unit.x, unit.y, unit.radius) for unit in units or ())
+
+    def get_path(self, wizard_id, start, goal, tick_index, deadline: Deadline = None):
+        # Reuse the previous path if we're still on it and it's still free.
+        previous = self.path_by_wizard_id.get(wizard_id)
+        if previous is not None:
+            previous_goal, previous_path, planned_tick_index = previous
+            if (
+                previous_goal == goal and
+                tick_index - planned_tick_index < Navigation.REPLAN_INTERVAL_TICKS and
+                start in previous_path
+            ):
+                path = previous_path[previous_path.index(start):]
+                if not any(self.blocked[index] for index in path[1:-1]):
+                    return path
+        started_at = time.perf_counter()
+        if deadline is not None:
+            with deadline.stage("path") as stage:
+                path = self.find_path(start, goal, stage)
+        else:
+            path = self.find_path(start, goal)
+        self.search_seconds += time.perf_counter() - started_at
+        self.path_by_wizard_id[wizard_id] = (goal, path, tick_index)
+        return path
+
+    def find_path(self, start, goal, stage: Deadline.Stage = None):
+        size, blocked, threat = self.size, self.blocked, self.threat
+        goal_x, goal_y = goal % size, goal // size
+        costs = {start: 0.0}
+        came_from = {start: None}
+        start_heuristic = self.get_heuristic(start, goal_x, goal_y)
+        queue = [(start_heuristic, 0.0, start)]
+        best, best_heuristic = start, float("+inf")
+        expanded_node_count = 0
+
+        while queue and expanded_node_count < Navigation.MAX_EXPANDED_NODES:
+            _, cost, index = heapq.heappop(queue)
+            if cost > costs[index]:
+                continue
+            expanded_node_count += 1
+            heuristic = self.get_heuristic(index, goal_x, goal_y)
+            if heuristic < best_heuristic:
+                best, best_heuristic = index, heuristic
+            if index == goal:
+                break
+            # The deadline is checked once in a while, quality is how close to the goal we've got.
+            if (
+                stage is not None and expanded_node_count % Navigation.DEADLINE_CHECK_INTERVAL == 0 and
+                stage.is_expired(1.0 - best_heuristic / start_heuristic, 1.0)
+            ):
+                break
+            x, y = index % size, index // size
+            for dx, dy, step_cost in Navigation.NEIGHBOURS:
+                next_x, next_y = x + dx, y + dy
+                if not (0 <= next_x < size and 0 <= next_y < size):
+                    continue
+                next_index = next_y * size + next_x
+                if blocked[next_index] and next_index != goal:
+                    continue
+                # Don't cut corners of blocked cells.
+                if dx and dy and (blocked[y * size + next_x] or blocked[next_y * size + x]):
+                    continue
+                next_cost = cost + step_cost + (Navigation.THREAT_COST if threat[next_index] else 0.0)
+                if next_cost < costs.get(next_index, float("+inf")):
+                    costs[next_index] = next_cost
+                    came_from[next_index] = index
+                    heapq.heappush(queue, (
+                        next_cost + self.get_heuristic(next_index, goal_x, goal_y), next_cost, next_index
+                    ))
+        self.expanded_node_count += expanded_node_count
+
+        # The goal may be unreachable or too far for the budget, then go to the closest cell found.
+        path = []
+        index = goal if goal in came_from else best
+        while index is not None:
+            path.append(index)
+            index = came_from[index]
+        path.reverse()
+        return path
+
+    def get_heuristic(self, index, goal_x, goal_y):
+        # Octile distance.
+        dx, dy = abs(index % self.size - goal_x), abs(index // self.size - goal_y)
+        return max(dx, dy) + (math.sqrt(2.0) - 1.0) * min(dx, dy)
+
+    def get_lookahead_point(self, x, y, path, goal_x, goal_y):
+        if len(path) < 2:
+            return goal_x, goal_y
+        waypoint = self.get_center(path[1])
+        for index in path[2:Navigation.LOOKAHEAD_CELLS + 1]:
+            center_x, center_y = self.get_center(index)
+            if not self.is_line_free(x, y, center_x, center_y):
+                break
+            waypoint = center_x, center_y
+        return waypoint
+
+    def is_line_free(self, x, y, other_x, other_y):
+        # The starting cell is never checked, we may be standing close to an obstacle.
+        start = self.get_index(x, y)
+        return not any(index != start and self.blocked[index] for index in self.get_line(x, y, other_x, other_y))
+
+    def is_line_threatened(self, x, y, other_x, other_y):
+        # Crossing enemy reach on the way is only worth avoiding if we're neither there nor going there.
+        threat = self.threat
+        if threat[self.get_index(x, y)] or threat[self.get_index(other_x, other_y)]:
+            return False
+        return any(threat[index] for index in self.get_line(x, y, other_x, other_y))
+
+    def get_line(self, x, y, other_x, other_y):
+        # Indices of cells along the segment, sampled every half cell.
+        step_count = int(math.hypot(other_x - x, other_y - y) / (0.5 * Grid.CELL_SIZE)) + 1
+        for step in range(1, step_count + 1):
+            yield self.get_index(x + (other_x - x) * step / step_count, y + (other_y - y) * step / step_count)
@@ -0,0 +1,49 @@
+import heapq
+import math
+
+
+class Routing:
+    # Next-hop table over a graph of tiles. Routes to a destination are computed once, on the first request, with
+    # Dijkstra's algorithm from the destination. By default edges cost the distance between the tiles.
+
+    def __init__(self, tiles, adjacent, weight=None, next_hops_by_destination=None):
+        self.tiles = tiles
+        self.adjacent = adjacent
+        self.weight = weight if weight is not None else self.get_distance
+        # Next hop from each tile by destination tile, None if the destination can't be reached. May be given
+        # prebuilt, see build_all.
+        self.next_hops_by_destination = next_hops_by_destination if next_hops_by_destination is not None else {}
+
+    def get_next_hop(self, index, destination_index):
+        next_hops = self.next_hops_by_destination.get(destination_index)
+        if next_hops is None:
+            next_hops = self.next_hops_by_destination[destination_index] = self.build_next_hops(destination_index)
+        return next_hops[index]
+
+    def build_all(self):
+        for destination_index in range(len(self.tiles)):
+            self.get_next_hop(destination_index, destination_index)
+        return self.next_hops_by_destination
+
+    def build_next_hops(self, destination_index):
+        next_hops = [None] * len(self.tiles)
+        next_hops[destination_index] = destination_index
+        costs = [float("+inf")] * len(self.tiles)
+        costs[destination_index] = 0.0
+        queue = [(0.0, destination_index)]
+        while queue:
+            cost, index = heapq.heappop(queue)
+            if cost > costs[index]:
+                continue
+            for previous_index in self.adjacent[index]:
+                previous_cost = cost + self.weight(previous_index, index)
+                if previous_cost < costs[previous_index]:
+                    costs[previous_index] = previous_cost
+                    # Going from the previous tile to the destination, the next step is the current tile.
+                    next_hops[previous_index] = index
+                    heapq.heappush(queue, (previous_cost, previous_index))
+        return next_hops
+
+    def get_distance(self, index, other_index):
+        (x, y), (other_x, other_y) = self.tiles[index], self.tiles[other_index]
+        return math.hypot(x - other_x, y - other_y)
@@ -1,51 +1,153 @@
+import os
 import sys
 
-from MyStrategy import MyStrategy
+# The model package is loaded from one precompiled bundle when it's set, see ModelBundle.
+if os.environ.get("FAST_STARTUP"):
+    from ModelBundle import ModelBundle
+    ModelBundle.install()
+
 from RemoteProcessClient import RemoteProcessClient
 from model.Move import Move
 
 
 class Runner:
+    # Optional components are imported only when they're enabled, and the strategy once the game context has come:
+    # numpy takes most of the startup time, so the client connects and reads the game while nothing else is loaded.
     def __init__(self):
-        if sys.argv.__len__() == 4:
-            self.remote_process_client = RemoteProcessClient(sys.argv[1], int(sys.argv[2]))
-            self.token = sys.argv[3]
+        # Strategy moves and decoding are profiled when a path for the collapsed stacks is given, either with
+        # --profile=path or in PROFILE_PATH.
+        self.profile_path = os.environ.get("PROFILE_PATH")
+        arguments = []
+        for argument in sys.argv:
+            if argument.startswith("--profile="):
+                self.profile_path = argument[len("--profile="):]
+            else:
+                arguments.append(argument)
+
+        # Socket I/O is done in a background thread when ASYNC_CLIENT is set.
+        if os.environ.get("ASYNC_CLIENT"):
+            from AsyncRemoteProcessClient import AsyncRemoteProcessClient
+            client_class = AsyncRemoteProcessClient
         else:
-            self.remote_process_client = RemoteProcessClient("127.0.0.1", 31001)
+            client_class = RemoteProcessClient
+        if arguments.__len__() == 4:
+            self.remote_process_client = client_class(arguments[1], int(arguments[2]))
+            self.token = arguments[3]
+        else:
+            self.remote_process_client = client_class("127.0.0.1", 31001)
             self.token = "0000000000000000"
+        # Raw traffic of the game is appended to this file, see SessionReplay.
+        capture_path = os.environ.get("SESSION_CAPTURE_PATH")
+        if capture_path:
+            self.remote_process_client.start_recording(capture_path)
+        # Trees are decoded into views over the raw message when TREE_VIEWS is set, see LazyTree.
+        self.remote_process_client.tree_views = bool(os.environ.get("TREE_VIEWS"))
+        # Per-tick timings are collected and reported against this budget, in milliseconds, when it's set.
+        budget = os.environ.get("LATENCY_BUDGET_MS")
+        self.latency_monitor = None
+        if budget:
+            from LatencyMonitor import LatencyMonitor
+            self.latency_monitor = LatencyMonitor(0.001 * float(budget))
+            self.latency_monitor.attach(self.remote_process_client)
+        self.profiler = None
+        if self.profile_path:
+            from SamplingProfiler import SamplingProfiler
+            self.profiler = SamplingProfiler()
+        # Anytime mode: moves settle for the best answer found in this time, in milliseconds, when it's set.
+        move_budget = os.environ.get("MOVE_BUDGET_MS")
+        self.move_budget = 0.001 * float(move_budget) if move_budget else None
+        # Wizards of a team move in parallel processes when it's set.
+        self.parallel_wizards = bool(os.environ.get("PARALLEL_WIZARDS"))
 
     def run(self):
+        latency_monitor = self.latency_monitor
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enable()
+        strategies = []
+        pool = None
         try:
             self.remote_process_client.write_token_message(self.token)
             self.remote_process_client.write_protocol_version_message()
             team_size = self.remote_process_client.read_team_size_message()
             game = self.remote_process_client.read_game_context_message()
 
-            strategies = []
+            if self.parallel_wizards and team_size > 1:
+                from StrategyPool import StrategyPool
+                pool = StrategyPool(team_size, game, self.move_budget)
+                get_search_totals = pool.get_search_totals
+            else:
+                from MyStrategy import MyStrategy, NAVIGATION
+                from ThreatMap import ThreatMap
+
+                # Computed once per tick for the whole team.
+                threat_map = ThreatMap(game.map_size)
 
-            for _ in range(team_size):
-                strategies.append(MyStrategy())
+                for _ in range(team_size):
+                    strategies.append(MyStrategy(threat_map, self.move_budget))
+
+                def get_search_totals():
+                    return NAVIGATION.search_seconds, NAVIGATION.expanded_node_count
 
             while True:
+                if latency_monitor is not None:
+                    latency_monitor.start_tick()
+                if profiler is not None:
+                    profiler.start("read_player_context_message")
                 player_context = self.remote_process_client.read_player_context_message()
+                if profiler is not None:
+                    profiler.stop()
                 if player_context is None:
                     break
+                if latency_monitor is not None:
+                    latency_monitor.end_read()
 
                 player_wizards = player_context.wizards
                 if player_wizards is None or player_wizards.__len__() != team_size:
                     break
 
+                if pool is not None:
+                    pool.send(player_context)
+
                 moves = []
 
                 for wizard_index in range(team_size):
                     player_wizard = player_wizards[wizard_index]
 
+                    if pool is not None:
+                        # Waiting for the worker, it's moving since the context was sent.
+                        moves.append(pool.receive(wizard_index))
+                        if latency_monitor is not None:
+                            latency_monitor.end_move(wizard_index)
+                        continue
+
                     move = Move()
                     moves.append(move)
+                    if profiler is not None:
+                        profiler.start("move")
                     strategies[wizard_index].move(player_wizard, player_context.world, game, move)
+                    if profiler is not None:
+                        profiler.stop()
+                    if latency_monitor is not None:
+                        latency_monitor.end_move(wizard_index)
 
+                if latency_monitor is not None:
+                    latency_monitor.end_search(*get_search_totals())
                 self.remote_process_client.write_moves_message(moves)
+                if latency_monitor is not None:
+                    latency_monitor.end_tick()
         finally:
+            if pool is not None:
+                # Workers print their own stage summaries.
+                pool.close()
+            if latency_monitor is not None:
+                latency_monitor.print_summary()
+            if profiler is not None:
+                profiler.disable()
+                profiler.write(self.profile_path)
+            if self.move_budget is not None:
+                for wizard_index, strategy in enumerate(strategies):
+                    strategy.deadline.print_summary("Wizard %d stages" % wizard_index)
             self.remote_process_client.close()
 
 
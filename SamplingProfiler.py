@@ -0,0 +1,54 @@
+import collections
+import signal
+import sys
+
+
+class SamplingProfiler:
+    # Statistical profiler of selected code regions. A CPU timer interrupts the process periodically and the stack
+    # is counted if a region is active, from the region down to the interrupted function. The result is written as
+    # collapsed stacks, one "region;module.function;... count" line per stack, ready for flamegraph tools.
+    INTERVAL_SECONDS = 0.001
+
+    def __init__(self, interval=INTERVAL_SECONDS):
+        if not hasattr(signal, "setitimer"):
+            raise RuntimeError("Sampling needs signal.setitimer, it isn't available on this platform.")
+        self.interval = interval
+        self.count_by_stack = collections.Counter()
+        self.region = None
+        # Frame which has started the region, the stacks are cut there.
+        self.root_frame = None
+        self.sample_count = 0
+
+    def enable(self):
+        signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+
+    def disable(self):
+        signal.setitimer(signal.ITIMER_PROF, 0.0)
+        signal.signal(signal.SIGPROF, signal.SIG_DFL)
+
+    def start(self, region):
+        # The timer keeps running, otherwise regions shorter than the interval would never be sampled.
+        self.root_frame = sys._getframe(1)
+        self.region = region
+
+    def stop(self):
+        self.region = None
+        self.root_frame = None
+
+    def sample(self, signal_number, frame):
+        if self.region is None:
+            return
+        names = []
+        while frame is not None and frame is not self.root_frame:
+            names.append("%s.%s" % (frame.f_globals.get("__name__", "?"), frame.f_code.co_name))
+            frame = frame.f_back
+        names.append(self.region)
+        names.reverse()
+        self.count_by_stack[";".join(names)] += 1
+        self.sample_count += 1
+
+    def write(self, path):
+        with open(path, "w") as output:
+            for stack, count in sorted(self.count_by_stack.items()):
+                output.write("%s %d\n" % (stack, count))
@@ -0,0 +1,52 @@
+import struct
+
+
+class SessionRecorder:
+    # Append-only capture of the raw protocol bytes. Each record is a kind, a payload length and the payload.
+    # A session starts with a SESSION record holding the format version, ticks start with an empty TICK record.
+    RECORD_STRUCT = struct.Struct("<BI")
+    VERSION_STRUCT = struct.Struct("<i")
+    VERSION = 1
+
+    SESSION = 1
+    TICK = 2
+    INBOUND = 3
+    OUTBOUND = 4
+
+    def __init__(self, path):
+        self.file = open(path, "ab")
+        self.write_record(SessionRecorder.SESSION, SessionRecorder.VERSION_STRUCT.pack(SessionRecorder.VERSION))
+
+    def write_tick(self):
+        # Previous tick is complete, make it survive a crash.
+        self.file.flush()
+        self.write_record(SessionRecorder.TICK, b"")
+
+    def write_inbound(self, data):
+        self.write_record(SessionRecorder.INBOUND, data)
+
+    def write_outbound(self, data):
+        self.write_record(SessionRecorder.OUTBOUND, data)
+
+    def write_record(self, kind, data):
+        self.file.write(SessionRecorder.RECORD_STRUCT.pack(kind, len(data)))
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def read_records(path):
+        # Yields (kind, payload) of all records in the file.
+        with open(path, "rb") as file:
+            while True:
+                header = file.read(SessionRecorder.RECORD_STRUCT.size)
+                if not header:
+                    return
+                if len(header) < SessionRecorder.RECORD_STRUCT.size:
+                    raise IOError("Truncated record header in %s." % path)
+                kind, length = SessionRecorder.RECORD_STRUCT.unpack(header)
+                data = file.read(length)
+                if len(data) < length:
+                    raise IOError("Truncated record in %s." % path)
+                yield kind, data
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# coding: utf-8
+
+import collections
+import hashlib
+import sys
+import time
+
+from model.Move import Move
+from MyStrategy import MyStrategy
+from RemoteProcessClient import RemoteProcessClient
+from SessionRecorder import SessionRecorder
+from ThreatMap import ThreatMap
+
+
+class SessionReplay:
+    # Socket stand-in that plays a captured session back to the client, no server needed. What the client sends is
+    # compared with what was sent in the captured session.
+
+    def __init__(self, path, session_index=0):
+        self.records = SessionReplay.read_session_records(path, session_index)
+        # Captured chunks not received yet, and the one being received.
+        self.inbound_chunks = collections.deque()
+        self.inbound = b""
+        self.inbound_offset = 0
+        # Captured bytes the client is expected to send.
+        self.outbound = bytearray()
+        self.tick_count = 0
+        # Sent bytes which differ from the captured ones.
+        self.mismatched_byte_count = 0
+
+    def read_record(self):
+        # Takes the next record of the capture, returns False at the end.
+        record = next(self.records, None)
+        if record is None:
+            return False
+        kind, data = record
+        if kind == SessionRecorder.INBOUND:
+            self.inbound_chunks.append(data)
+        elif kind == SessionRecorder.OUTBOUND:
+            self.outbound.extend(data)
+        elif kind == SessionRecorder.TICK:
+            self.tick_count += 1
+        return True
+
+    def skip_handshake(self):
+        # Token and protocol version are sent before anything is received, they're dropped for clients which don't
+        # send them.
+        while not self.inbound_chunks and self.read_record():
+            pass
+        del self.outbound[:]
+
+    def recv_into(self, buffer):
+        while self.inbound_offset == len(self.inbound):
+            if not self.inbound_chunks and not self.read_record():
+                return 0
+            if self.inbound_chunks:
+                self.inbound, self.inbound_offset = self.inbound_chunks.popleft(), 0
+
+        chunk_size = min(len(buffer), len(self.inbound) - self.inbound_offset)
+        buffer[:chunk_size] = self.inbound[self.inbound_offset:self.inbound_offset + chunk_size]
+        self.inbound_offset += chunk_size
+        return chunk_size
+
+    def sendall(self, data):
+        data = bytes(data)
+        # Sent bytes are compared with what was captured for the same tick.
+        while len(self.outbound) < len(data) and self.read_record():
+            pass
+        expected = self.outbound[:len(data)]
+        del self.outbound[:len(data)]
+        self.mismatched_byte_count += sum(1 for byte, expected_byte in zip(data, expected) if byte != expected_byte)
+        self.mismatched_byte_count += len(data) - len(expected)
+
+    def close(self):
+        self.records.close()
+
+    @staticmethod
+    def read_session_records(path, session_index):
+        index = -1
+        for kind, data in SessionRecorder.read_records(path):
+            if kind == SessionRecorder.SESSION:
+                index += 1
+                version, = SessionRecorder.VERSION_STRUCT.unpack(data)
+                if index == session_index and version != SessionRecorder.VERSION:
+                    raise ValueError("Unsupported capture version %d." % version)
+            elif index == session_index:
+                yield kind, data
+            elif index > session_index:
+                return
+
+    @staticmethod
+    def read_session(path, session_index=0):
+        # Decodes a captured session, returns team size, game and a generator of player contexts.
+        client = RemoteProcessClient(None, None, SessionReplay(path, session_index))
+        team_size = client.read_team_size_message()
+        game = client.read_game_context_message()
+
+        def read_player_contexts():
+            try:
+                while True:
+                    player_context = client.read_player_context_message()
+                    if player_context is None:
+                        return
+                    yield player_context
+            finally:
+                client.close()
+
+        return team_size, game, read_player_contexts()
+
+    @staticmethod
+    def run_decode(path, session_index=0):
+        # Decoding only. The digest is of the decoded contexts re-encoded in full, it's the same for decoders which
+        # read the same data.
+        client = RemoteProcessClient(None, None, SessionReplay(path, session_index))
+        client.read_team_size_message()
+        client.read_game_context_message()
+        digest = hashlib.sha1()
+        latencies = []
+        while True:
+            started_at = time.perf_counter()
+            player_context = client.read_player_context_message()
+            latencies.append(time.perf_counter() - started_at)
+            if player_context is None:
+                break
+            client.write_player_context(player_context)
+            digest.update(client.write_buffer[:client.write_offset])
+            client.write_offset = 0
+        client.close()
+        SessionReplay.print_latencies("decode", latencies)
+        print("digest %s" % digest.hexdigest())
+
+    @staticmethod
+    def run_strategy(path, session_index=0):
+        # The runner loop on the captured traffic. Moves are compared with the captured ones.
+        replay = SessionReplay(path, session_index)
+        # The handshake isn't sent here.
+        replay.skip_handshake()
+        client = RemoteProcessClient(None, None, replay)
+        team_size = client.read_team_size_message()
+        game = client.read_game_context_message()
+        threat_map = ThreatMap(game.map_size)
+        strategies = [MyStrategy(threat_map) for _ in range(team_size)]
+        decode_latencies, move_latencies = [], []
+        while True:
+            started_at = time.perf_counter()
+            player_context = client.read_player_context_message()
+            decode_latencies.append(time.perf_counter() - started_at)
+            if player_context is None or player_context.wizards is None:
+                break
+            if len(player_context.wizards) != team_size:
+                break
+            started_at = time.perf_counter()
+            moves = []
+            for strategy, wizard in zip(strategies, player_context.wizards):
+                move = Move()
+                moves.append(move)
+                strategy.move(wizard, player_context.world, game, move)
+            move_latencies.append(time.perf_counter() - started_at)
+            client.write_moves_message(moves)
+        client.close()
+        SessionReplay.print_latencies("decode", decode_latencies)
+        SessionReplay.print_latencies("move", move_latencies)
+        print("%d bytes of moves differ from the capture" % replay.mismatched_byte_count)
+
+    @staticmethod
+    def print_latencies(name, latencies):
+        if not latencies:
+            print("%s: no ticks" % name)
+            return
+        latencies = sorted(latencies)
+        print("%s: %d ticks, total %.3f s, p50 %.3f ms, p99 %.3f ms, max %.3f ms" % (
+            name, len(latencies), sum(latencies), 1e3 * latencies[len(latencies) // 2],
+            1e3 * latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))], 1e3 * latencies[-1],
+        ))
+
+
+if __name__ == "__main__":
+    # SessionReplay.py capture_path [decode|strategy] [session_index]
+    command = sys.argv[2] if sys.argv.__len__() > 2 else "decode"
+    getattr(SessionReplay, "run_" + command)(sys.argv[1], int(sys.argv[3]) if sys.argv.__len__() > 3 else 0)
@@ -0,0 +1,206 @@
+import math
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from model.ActionType import ActionType
+from model.Game import Game
+from model.Minion import Minion
+from model.ProjectileType import ProjectileType
+from model.Unit import Unit
+from model.Wizard import Wizard
+from WorldArrays import WorldArrays
+
+
+class Simulator:
+    # Deterministic forward model of the next ticks. Units keep their current speed, projectiles fly straight until
+    # they touch a unit or leave the cast range of their owner. All rollouts are advanced at once with numpy, arrays
+    # are indexed by tick first. Positions are taken after each tick: a projectile moves less than the diameter of
+    # anything it may hit, so no contact is missed.
+    HORIZON_TICKS = 20
+
+    def __init__(self, arrays: WorldArrays, game: Game, horizon_ticks=HORIZON_TICKS):
+        self.game = game
+        self.ticks = numpy.arange(1.0, horizon_ticks + 1.0)
+
+        # Everything a projectile may hit, the columns come from the view of the world.
+        self.bodies = arrays.obstacle_units
+        self.index_by_id = {unit.id: index for index, unit in enumerate(self.bodies)}
+        self.body_ids = arrays.obstacle_ids
+        x, y, speed_x, speed_y = arrays.obstacle_x, arrays.obstacle_y, arrays.obstacle_speed_x, arrays.obstacle_speed_y
+        self.body_x, self.body_y, self.body_radius = x, y, arrays.obstacle_radius
+        self.body_xs = x + numpy.outer(self.ticks, speed_x)
+        self.body_ys = y + numpy.outer(self.ticks, speed_y)
+        # How far from its current position a body may reach within the horizon.
+        self.body_reach = float((self.body_radius + horizon_ticks * numpy.hypot(speed_x, speed_y)).max(initial=0.0))
+
+        # Projectiles in flight.
+        projectiles = arrays.projectiles
+        self.projectiles = projectiles.units
+        self.projectile_radius = projectiles.radius
+        self.projectile_last_ticks = numpy.array(
+            [self.get_remaining_ticks(projectile) for projectile in self.projectiles], dtype=numpy.float64,
+        )
+        self.projectile_xs = projectiles.x + numpy.outer(self.ticks, projectiles.speed_x)
+        self.projectile_ys = projectiles.y + numpy.outer(self.ticks, projectiles.speed_y)
+        self.projectile_owner_ids = [projectile.owner_unit_id for projectile in self.projectiles]
+
+    def get_damage(self, me: Wizard, speeds_x, speeds_y):
+        # Damage from enemy projectiles for each constant velocity of the wizard.
+        speeds_x, speeds_y = numpy.asarray(speeds_x, dtype=numpy.float64), numpy.asarray(speeds_y, dtype=numpy.float64)
+        damages = numpy.zeros(speeds_x.shape)
+        game = self.game
+        if not self.projectiles:
+            return damages
+        # Only enemy projectiles passing near enough may hurt.
+        reach = me.radius + len(self.ticks) * float(numpy.hypot(speeds_x, speeds_y).max(initial=0.0)) + (
+            game.fireball_explosion_min_damage_range + game.fireball_radius
+        )
+        is_near = numpy.hypot(self.projectile_xs - me.x, self.projectile_ys - me.y).min(axis=0) < reach
+        indexes = [
+            index
+            for index, projectile in enumerate(self.projectiles)
+            if is_near[index] and projectile.faction != me.faction and projectile.owner_unit_id != me.id
+        ]
+        if not indexes:
+            return damages
+
+        # Where the projectiles stop if the wizard isn't in the way.
+        gaps, body_indexes = self.get_gaps(
+            self.projectile_xs[:, indexes], self.projectile_ys[:, indexes], self.projectile_radius[indexes],
+            [self.projectile_owner_ids[index] for index in indexes],
+        )
+        gaps[:, :, self.body_ids[body_indexes] == me.id] = numpy.inf
+        last_ticks = self.projectile_last_ticks[indexes]
+        stop_indexes, _ = self.get_first_contacts(gaps, body_indexes, last_ticks)
+        stop_indexes = numpy.minimum(stop_indexes, self.get_last_indexes(last_ticks))
+
+        # Tick × velocity × projectile.
+        me_xs = me.x + numpy.outer(self.ticks, speeds_x)
+        me_ys = me.y + numpy.outer(self.ticks, speeds_y)
+        projectile_xs, projectile_ys = self.projectile_xs[:, indexes], self.projectile_ys[:, indexes]
+        distances = numpy.hypot(
+            me_xs[:, :, None] - projectile_xs[:, None, :], me_ys[:, :, None] - projectile_ys[:, None, :],
+        )
+        is_hit = distances < me.radius + self.projectile_radius[indexes]
+        is_hit &= numpy.arange(len(self.ticks))[:, None, None] <= stop_indexes
+        hit_indexes = numpy.where(is_hit.any(axis=0), is_hit.argmax(axis=0), len(self.ticks))
+
+        for column, index in enumerate(indexes):
+            projectile_type = self.projectiles[index].type
+            if projectile_type != ProjectileType.FIREBALL:
+                damages[hit_indexes[:, column] < len(self.ticks)] += Simulator.get_direct_damage(game, projectile_type)
+                continue
+            # Fireball explodes on the first contact or at the end of its range.
+            explosion_indexes = numpy.minimum(hit_indexes[:, column], stop_indexes[column])
+            is_exploded = explosion_indexes < len(self.ticks)
+            explosion_distances = distances[
+                numpy.minimum(explosion_indexes, len(self.ticks) - 1), numpy.arange(len(speeds_x)), column,
+            ] - me.radius
+            damages += numpy.where(is_exploded, Simulator.get_explosion_damage(game, explosion_distances), 0.0)
+        return damages
+
+    def get_cast_hits(self, me: Wizard, angles, action_type, target: Unit):
+        # Whether a projectile cast in each of the absolute angles hits the target.
+        angles = numpy.asarray(angles, dtype=numpy.float64)
+        target_index = self.index_by_id.get(target.id)
+        if target_index is None:
+            # Nothing is known about the target, don't hold the cast.
+            return numpy.ones(angles.shape, dtype=bool)
+        game = self.game
+        speed, radius = Simulator.get_projectile_speed_and_radius(game, action_type)
+        xs = me.x + numpy.outer(self.ticks, speed * numpy.cos(angles))
+        ys = me.y + numpy.outer(self.ticks, speed * numpy.sin(angles))
+        last_ticks = numpy.full(angles.shape, me.cast_range / speed)
+        gaps, body_indexes = self.get_gaps(xs, ys, numpy.full(angles.shape, radius), [me.id] * len(angles))
+        contact_indexes, contact_bodies = self.get_first_contacts(gaps, body_indexes, last_ticks)
+
+        if action_type != ActionType.FIREBALL:
+            return (contact_indexes < len(self.ticks)) & (contact_bodies == target_index)
+        # Fireball damages the target if it's near enough when the fireball explodes.
+        explosion_indexes = numpy.minimum(contact_indexes, self.get_last_indexes(last_ticks))
+        explosion_indexes = numpy.minimum(explosion_indexes, len(self.ticks) - 1)
+        columns = numpy.arange(len(angles))
+        explosion_distances = numpy.hypot(
+            xs[explosion_indexes, columns] - self.body_xs[explosion_indexes, target_index],
+            ys[explosion_indexes, columns] - self.body_ys[explosion_indexes, target_index],
+        ) - self.body_radius[target_index]
+        return explosion_distances <= game.fireball_explosion_min_damage_range
+
+    def get_gaps(self, xs, ys, radius, excluded_ids):
+        # Tick × rollout × body distances between the edges, negative on contact, and indexes of the bodies. Only
+        # bodies near the box around the tracks are compared. Each rollout ignores one body.
+        margin = float(radius.max(initial=0.0)) + self.body_reach
+        body_indexes = numpy.flatnonzero(
+            (self.body_x > xs.min(initial=0.0) - margin) & (self.body_x < xs.max(initial=0.0) + margin) &
+            (self.body_y > ys.min(initial=0.0) - margin) & (self.body_y < ys.max(initial=0.0) + margin)
+        )
+        body_xs, body_ys = self.body_xs[:, body_indexes], self.body_ys[:, body_indexes]
+        gaps = numpy.hypot(
+            xs[:, :, None] - body_xs[:, None, :], ys[:, :, None] - body_ys[:, None, :],
+        ) - (radius[:, None] + self.body_radius[body_indexes])
+        gaps[:, self.body_ids[body_indexes] == numpy.asarray(excluded_ids, dtype=numpy.int64)[:, None]] = numpy.inf
+        return gaps, body_indexes
+
+    def get_first_contacts(self, gaps, body_indexes, last_ticks):
+        # Tick index and body index of the first contact of each rollout within its range, the tick index is the
+        # horizon if there's none. Of bodies touched on the same tick the deepest one goes first.
+        if not gaps.shape[2]:
+            return numpy.full(gaps.shape[1], len(self.ticks)), numpy.full(gaps.shape[1], -1)
+        is_touching = (gaps < 0.0).any(axis=2)
+        is_touching &= self.ticks[:, None] <= numpy.ceil(last_ticks)
+        indexes = numpy.where(is_touching.any(axis=0), is_touching.argmax(axis=0), len(self.ticks))
+        columns = numpy.arange(gaps.shape[1])
+        bodies = gaps[numpy.minimum(indexes, len(self.ticks) - 1), columns].argmin(axis=1)
+        return indexes, body_indexes[bodies]
+
+    @staticmethod
+    def get_last_indexes(last_ticks):
+        # Index of the last tick the projectile flies, a projectile at the end of its range stops on the next one.
+        return numpy.maximum(numpy.ceil(last_ticks).astype(numpy.int64) - 1, 0)
+
+    def get_remaining_ticks(self, projectile):
+        owner_index = self.index_by_id.get(projectile.owner_unit_id)
+        owner = self.bodies[owner_index] if owner_index is not None else None
+        if isinstance(owner, Wizard):
+            cast_range = owner.cast_range
+        elif isinstance(owner, Minion):
+            cast_range = self.game.fetish_blowdart_attack_range
+        else:
+            cast_range = self.game.wizard_cast_range
+        # The owner has hardly moved since the cast.
+        flown = math.hypot(projectile.x - owner.x, projectile.y - owner.y) if owner is not None else 0.0
+        speed = math.hypot(projectile.speed_x, projectile.speed_y)
+        return max(cast_range - flown, 0.0) / speed if speed > 0.0 else 0.0
+
+    @staticmethod
+    def get_projectile_speed_and_radius(game: Game, action_type):
+        if action_type == ActionType.FROST_BOLT:
+            return game.frost_bolt_speed, game.frost_bolt_radius
+        if action_type == ActionType.FIREBALL:
+            return game.fireball_speed, game.fireball_radius
+        return game.magic_missile_speed, game.magic_missile_radius
+
+    @staticmethod
+    def get_direct_damage(game: Game, projectile_type):
+        if projectile_type == ProjectileType.FROST_BOLT:
+            return game.frost_bolt_direct_damage
+        if projectile_type == ProjectileType.DART:
+            return game.dart_direct_damage
+        return game.magic_missile_direct_damage
+
+    @staticmethod
+    def get_explosion_damage(game: Game, distances):
+        # Full damage near the center, then falling linearly to the edge of the explosion. Burning comes on top.
+        near, far = game.fireball_explosion_max_damage_range, game.fireball_explosion_min_damage_range
+        fraction = numpy.clip((distances - near) / (far - near), 0.0, 1.0)
+        damages = game.fireball_explosion_max_damage + fraction * (
+            game.fireball_explosion_min_damage - game.fireball_explosion_max_damage
+        )
+        return numpy.where(distances <= far, damages + game.burning_summary_damage, 0.0)
+
+    @staticmethod
+    def is_available():
+        return numpy is not None
@@ -0,0 +1,19 @@
+from model.Game import Game
+from model.World import World
+from Simulator import Simulator
+from WorldArrays import WorldArrays
+
+
+class SimulatorCache:
+    # Forward model of the current tick, shared by the wizards of the team. Each tick has its own world, the model is
+    # built on first use in it.
+
+    def __init__(self):
+        self.world = None
+        self.simulator = None
+
+    def get(self, world: World, arrays: WorldArrays, game: Game) -> Simulator:
+        if world is not self.world:
+            self.world = world
+            self.simulator = Simulator(arrays, game)
+        return self.simulator
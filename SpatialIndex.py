@@ -0,0 +1,139 @@
+import heapq
+import math
+
+from model.World import World
+
+
+class SpatialIndex:
+    # Uniform grid over buildings, minions, wizards and trees. A unit is stored in the cell of its center, each unit
+    # kind has its own cells, so that queries for living enemies don't walk through the trees.
+    CELL_SIZE = 200.0
+
+    BUILDINGS = 0
+    MINIONS = 1
+    WIZARDS = 2
+    TREES = 3
+    ALL_KINDS = (BUILDINGS, MINIONS, WIZARDS, TREES)
+
+    def __init__(self, world: World = None):
+        # Non-empty cells of each kind by cell coordinates.
+        self.cells = tuple({} for _ in SpatialIndex.ALL_KINDS)
+        self.cell_by_id = {}
+        self.unit_by_id = {}
+        # Queries look this much further to catch big units centered in neighbouring cells.
+        self.max_radius = 0.0
+        self.tick_index = None
+        self.unit_lists = (None, None, None, None)
+        if world is not None:
+            self.update(world)
+
+    def update(self, world: World):
+        unit_lists = (world.buildings, world.minions, world.wizards, world.trees)
+
+        # Drop units which aren't in the world anymore. Removed ids are only enough if we've seen the previous tick.
+        if world.removed_unit_ids is not None and self.tick_index == world.tick_index - 1:
+            removed_ids = world.removed_unit_ids
+        else:
+            alive_ids = {unit.id for units in unit_lists if units is not None for unit in units}
+            removed_ids = [unit_id for unit_id in self.unit_by_id if unit_id not in alive_ids]
+        for unit_id in removed_ids:
+            self.remove(unit_id)
+
+        # Re-insert changed units. Lists reused from the previous tick have no changes at all.
+        for kind, units, previous_units in zip(SpatialIndex.ALL_KINDS, unit_lists, self.unit_lists):
+            if units is None or units is previous_units:
+                continue
+            for unit in units:
+                if self.unit_by_id.get(unit.id) is not unit:
+                    self.insert(kind, unit)
+
+        self.unit_lists = unit_lists
+        self.tick_index = world.tick_index
+
+    def insert(self, kind, unit):
+        self.remove(unit.id)
+        cell = SpatialIndex.get_cell(unit.x, unit.y)
+        self.cells[kind].setdefault(cell, []).append(unit)
+        self.cell_by_id[unit.id] = kind, cell
+        self.unit_by_id[unit.id] = unit
+        if unit.radius > self.max_radius:
+            self.max_radius = unit.radius
+
+    def remove(self, unit_id):
+        kind_cell = self.cell_by_id.pop(unit_id, None)
+        if kind_cell is not None:
+            kind, cell = kind_cell
+            units = self.cells[kind][cell]
+            units.remove(self.unit_by_id.pop(unit_id))
+            if not units:
+                del self.cells[kind][cell]
+
+    def get_units_near(self, x: float, y: float, distance: float, kinds=ALL_KINDS):
+        # Units with centers closer than the distance.
+        distance_squared = distance * distance
+        return [
+            unit
+            for unit in self.get_candidates(x, y, distance, kinds)
+            if (unit.x - x) * (unit.x - x) + (unit.y - y) * (unit.y - y) < distance_squared
+        ]
+
+    def get_units_touching(self, x: float, y: float, radius: float, kinds=ALL_KINDS):
+        # Units whose circles intersect the circle.
+        return [
+            unit
+            for unit in self.get_candidates(x, y, radius + self.max_radius, kinds)
+            if math.hypot(unit.x - x, unit.y - y) < radius + unit.radius
+        ]
+
+    def get_nearest(self, x: float, y: float, count=1, predicate=None, kinds=ALL_KINDS):
+        occupied_cells = [cell for kind in kinds for cell in self.cells[kind]]
+        if not occupied_cells:
+            return []
+        # Look through rings of cells around the point until the found units are surely the nearest.
+        center_x, center_y = SpatialIndex.get_cell(x, y)
+        max_ring = max(max(abs(cell_x - center_x), abs(cell_y - center_y)) for cell_x, cell_y in occupied_cells)
+        found = []
+        for ring in range(max_ring + 1):
+            for cell in SpatialIndex.get_ring(center_x, center_y, ring):
+                for kind in kinds:
+                    for unit in self.cells[kind].get(cell, ()):
+                        if predicate is None or predicate(unit):
+                            found.append((math.hypot(unit.x - x, unit.y - y), unit.id, unit))
+            # Units outside of the visited rings are at least this far.
+            if len(found) >= count and heapq.nsmallest(count, found)[-1][0] <= ring * SpatialIndex.CELL_SIZE:
+                break
+        return [unit for _, _, unit in heapq.nsmallest(count, found)]
+
+    def get_candidates(self, x: float, y: float, distance: float, kinds=ALL_KINDS):
+        min_x, min_y = SpatialIndex.get_cell(x - distance, y - distance)
+        max_x, max_y = SpatialIndex.get_cell(x + distance, y + distance)
+        box_cell_count = (max_x - min_x + 1) * (max_y - min_y + 1)
+        for kind in kinds:
+            cells = self.cells[kind]
+            if box_cell_count > len(cells):
+                # Sparse kind, cheaper to walk through its non-empty cells.
+                for (cell_x, cell_y), units in cells.items():
+                    if min_x <= cell_x <= max_x and min_y <= cell_y <= max_y:
+                        yield from units
+            else:
+                for cell_x in range(min_x, max_x + 1):
+                    for cell_y in range(min_y, max_y + 1):
+                        units = cells.get((cell_x, cell_y))
+                        if units:
+                            yield from units
+
+    @staticmethod
+    def get_cell(x: float, y: float):
+        return int(math.floor(x / SpatialIndex.CELL_SIZE)), int(math.floor(y / SpatialIndex.CELL_SIZE))
+
+    @staticmethod
+    def get_ring(center_x, center_y, ring):
+        if ring == 0:
+            yield center_x, center_y
+            return
+        for cell_x in range(center_x - ring, center_x + ring + 1):
+            yield cell_x, center_y - ring
+            yield cell_x, center_y + ring
+        for cell_y in range(center_y - ring + 1, center_y + ring):
+            yield center_x - ring, cell_y
+            yield center_x + ring, cell_y
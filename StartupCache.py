@@ -0,0 +1,34 @@
+import marshal
+import os
+import sys
+
+
+class StartupCache:
+    # Values which are costly to build on startup, kept in marshal files next to the code. A value is rebuilt when its
+    # key changes or its file can't be read. It's still returned if the file can't be written.
+    DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__startupcache__")
+
+    @staticmethod
+    def load(name, key, build):
+        path = os.path.join(StartupCache.DIRECTORY, name + ".marshal")
+        # Marshal format depends on the interpreter version.
+        key = (sys.implementation.cache_tag, key)
+        try:
+            with open(path, "rb") as file:
+                cached_key, value = marshal.load(file)
+            if cached_key == key:
+                return value
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        value = build()
+        try:
+            os.makedirs(StartupCache.DIRECTORY, exist_ok=True)
+            # Another process may be reading the file, it's replaced at once.
+            temporary_path = "%s.%d" % (path, os.getpid())
+            with open(temporary_path, "wb") as file:
+                marshal.dump((key, value), file)
+            os.replace(temporary_path, path)
+        except OSError:
+            pass
+        return value
@@ -0,0 +1,101 @@
+import multiprocessing
+import pickle
+
+from model.Game import Game
+from model.Move import Move
+from model.PlayerContext import PlayerContext
+from model.World import World
+from MyStrategy import MyStrategy, NAVIGATION
+from ThreatMap import ThreatMap
+from WorldState import WorldState
+
+
+class StrategyPool:
+    # Runs the strategy of each wizard in its own process, so that a team is evaluated in parallel. The world is
+    # pickled once per tick and the same bytes go to every worker. Players, buildings and trees are only sent when
+    # their lists change, workers keep the previous ones. Ids of added, removed and changed units go along, so that
+    # each worker keeps its own incremental indexes, see WorldState.update_copy.
+
+    def __init__(self, team_size, game: Game, move_budget=None):
+        # Workers are forked with the game already in memory. Spawned ones would re-run the runner script.
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("Parallel wizards need the fork start method, it isn't available on this platform.")
+        context = multiprocessing.get_context("fork")
+        self.connections = []
+        self.processes = []
+        for wizard_index in range(team_size):
+            connection, worker_connection = context.Pipe()
+            process = context.Process(
+                target=StrategyPool.run_worker, args=(worker_connection, wizard_index, game, move_budget), daemon=True,
+            )
+            process.start()
+            worker_connection.close()
+            self.connections.append(connection)
+            self.processes.append(process)
+        # Players, buildings and trees sent to the workers.
+        self.static_lists = (None, None, None)
+        # Path search time and expanded nodes of each worker, totals of the game.
+        self.search_totals = [(0.0, 0)] * team_size
+
+    def send(self, player_context: PlayerContext):
+        world = player_context.world
+        static_lists = (world.players, world.buildings, world.trees)
+        snapshot = pickle.dumps((
+            world.tick_index, world.tick_count, world.width, world.height, world.wizards, world.minions,
+            world.projectiles, world.bonuses,
+            tuple(None if units is sent_units else units for units, sent_units in zip(static_lists, self.static_lists)),
+            world.added_unit_ids, world.removed_unit_ids, world.changed_unit_ids, player_context.wizards,
+        ), pickle.HIGHEST_PROTOCOL)
+        self.static_lists = static_lists
+        for connection in self.connections:
+            connection.send_bytes(snapshot)
+
+    def receive(self, wizard_index) -> Move:
+        move, self.search_totals[wizard_index] = self.connections[wizard_index].recv()
+        return move
+
+    def get_search_totals(self):
+        # Summed over the workers, searches of different workers may run at the same time.
+        return (
+            sum(seconds for seconds, _ in self.search_totals),
+            sum(node_count for _, node_count in self.search_totals),
+        )
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+        for process in self.processes:
+            process.join(1.0)
+            if process.is_alive():
+                process.terminate()
+
+    @staticmethod
+    def run_worker(connection, wizard_index, game: Game, move_budget):
+        strategy = MyStrategy(ThreatMap(game.map_size), move_budget)
+        static_lists = (None, None, None)
+        world_state = WorldState({})
+        while True:
+            try:
+                snapshot = connection.recv_bytes()
+            except EOFError:
+                break
+            (
+                tick_index, tick_count, width, height, wizards, minions, projectiles, bonuses, changed_static_lists,
+                added_ids, removed_ids, changed_ids, player_wizards,
+            ) = pickle.loads(snapshot)
+            # Unchanged lists stay the same objects, so that caches keyed by them still work.
+            static_lists = tuple(
+                units if changed_units is None else changed_units
+                for units, changed_units in zip(static_lists, changed_static_lists)
+            )
+            players, buildings, trees = static_lists
+            world = World(
+                tick_index, tick_count, width, height, players, wizards, minions, projectiles, bonuses, buildings, trees,
+            )
+            if removed_ids is not None:
+                world_state.update_copy(world, added_ids, removed_ids, changed_ids)
+            move = Move()
+            strategy.move(player_wizards[wizard_index], world, game, move)
+            connection.send((move, (NAVIGATION.search_seconds, NAVIGATION.expanded_node_count)))
+        if move_budget is not None:
+            strategy.deadline.print_summary("Wizard %d stages" % wizard_index)
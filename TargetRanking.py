@@ -0,0 +1,117 @@
+import bisect
+import math
+
+from model.Game import Game
+from model.LivingUnit import LivingUnit
+from model.Minion import Minion
+from model.Unit import Unit
+from model.Wizard import Wizard
+from model.World import World
+from SpatialIndex import SpatialIndex
+
+
+class TargetRanking:
+    # Enemy wizards, minions and buildings ranked by utility, best first. Each wizard keeps its own ranking between
+    # ticks and only units which changed are ranked again, the same way SpatialIndex is updated. Queries walk the
+    # ranking in order, so that the caller stops at the first target it can attack.
+
+    def __init__(self, utility=None):
+        # Utility of a unit for the game, see get_score_utility.
+        self.utility = utility if utility is not None else TargetRanking.get_score_utility
+        # Sorted keys: negated utility, life and id. Of equally useful targets the weakest goes first.
+        self.keys = []
+        self.key_by_id = {}
+        self.unit_by_id = {}
+        self.kind_by_id = {}
+        self.faction = None
+        self.world = None
+        self.tick_index = None
+        self.unit_lists = (None, None, None)
+
+    def update(self, world: World, game: Game, faction):
+        if world is self.world and faction == self.faction:
+            return
+        if faction != self.faction:
+            # Nothing ranked for another faction is of use.
+            self.keys.clear()
+            self.key_by_id.clear()
+            self.unit_by_id.clear()
+            self.kind_by_id.clear()
+            self.unit_lists = (None, None, None)
+            self.faction = faction
+        unit_lists = (world.buildings, world.minions, world.wizards)
+
+        # Removed ids are only enough if we've seen the previous tick.
+        if world.removed_unit_ids is not None and self.tick_index == world.tick_index - 1:
+            removed_ids = [unit_id for unit_id in world.removed_unit_ids if unit_id in self.key_by_id]
+        else:
+            alive_ids = {unit.id for units in unit_lists if units is not None for unit in units}
+            removed_ids = [unit_id for unit_id in self.key_by_id if unit_id not in alive_ids]
+        for unit_id in removed_ids:
+            self.remove(unit_id)
+
+        # Rank changed units again. Lists reused from the previous tick have no changes at all.
+        for kind, units, previous_units in zip(
+            (SpatialIndex.BUILDINGS, SpatialIndex.MINIONS, SpatialIndex.WIZARDS), unit_lists, self.unit_lists,
+        ):
+            if units is None or units is previous_units:
+                continue
+            unit_by_id = self.unit_by_id
+            for unit in units:
+                if unit.faction != faction:
+                    continue
+                previous_unit = unit_by_id.get(unit.id)
+                if previous_unit is None or previous_unit.life != unit.life or previous_unit.max_life != unit.max_life:
+                    self.insert(game, kind, unit)
+                else:
+                    # Moving doesn't change the rank.
+                    unit_by_id[unit.id] = unit
+
+        self.world = world
+        self.tick_index = world.tick_index
+        self.unit_lists = unit_lists
+
+    def insert(self, game: Game, kind, unit: LivingUnit):
+        self.remove(unit.id)
+        key = self.key_by_id[unit.id] = (-self.utility(game, unit), unit.life, unit.id)
+        bisect.insort(self.keys, key)
+        self.unit_by_id[unit.id] = unit
+        self.kind_by_id[unit.id] = kind
+
+    def remove(self, unit_id):
+        key = self.key_by_id.pop(unit_id, None)
+        if key is not None:
+            del self.keys[bisect.bisect_left(self.keys, key)]
+            del self.unit_by_id[unit_id]
+            del self.kind_by_id[unit_id]
+
+    def get_targets(self, me: Unit, distance: float, kinds=SpatialIndex.ALL_KINDS):
+        # Units of the kinds with centers closer than the distance, best first.
+        for _, _, unit_id in self.keys:
+            if self.kind_by_id[unit_id] in kinds:
+                unit = self.unit_by_id[unit_id]
+                if math.hypot(unit.x - me.x, unit.y - me.y) < distance:
+                    yield unit
+
+    def get_nearest_target(self, me: Unit, distance: float, kinds=SpatialIndex.ALL_KINDS):
+        # Of equally distant units the best one.
+        return min(
+            self.get_targets(me, distance, kinds), key=(lambda unit: math.hypot(unit.x - me.x, unit.y - me.y)),
+            default=None,
+        )
+
+    @staticmethod
+    def get_score_utility(game: Game, unit: LivingUnit):
+        # Score a magic missile brings: its damage, and the elimination when it's enough to finish the unit off.
+        if isinstance(unit, Wizard):
+            damage_factor, elimination_factor = game.wizard_damage_score_factor, game.wizard_elimination_score_factor
+        elif isinstance(unit, Minion):
+            damage_factor, elimination_factor = game.minion_damage_score_factor, game.minion_elimination_score_factor
+        else:
+            damage_factor, elimination_factor = (
+                game.building_damage_score_factor, game.building_elimination_score_factor,
+            )
+        damage = game.magic_missile_direct_damage
+        if damage < unit.life:
+            return damage_factor * damage
+        return damage_factor * unit.life + elimination_factor * unit.max_life
@@ -0,0 +1,198 @@
+import math
+import operator
+
+from model.Game import Game
+from model.MinionType import MinionType
+from model.SkillType import SkillType
+from model.Wizard import Wizard
+from model.World import World
+from Grid import Grid
+from WorldArrays import UnitArrays, WorldArrays
+
+
+class ThreatMap(Grid):
+    # Coarse grid of enemy reach. Each cell counts the threats of each kind that can hit a wizard standing at its
+    # center and sums their expected damage. The grid is updated once per tick: only threats that moved or changed
+    # their state are taken out and put back, so the whole team gets danger checks as lookups.
+    # Lookups take the cell containing the point, so a cell is marked when any point of it is within reach: reach is
+    # extended by half the cell diagonal. Danger is over-reported near the edge rather than missed.
+    CELL_MARGIN = Grid.CELL_SIZE / math.sqrt(2.0)
+
+    MINIONS = 0
+    # Wizards ready to cast.
+    WIZARDS = 1
+    # Ready wizards with fireball or frost bolt.
+    STRONG_WIZARDS = 2
+    TOWERS = 3
+    # Towers ready to shoot.
+    READY_TOWERS = 4
+    # Any of the above, Navigation steers around these.
+    ANY = 5
+    ALL_KINDS = (MINIONS, WIZARDS, STRONG_WIZARDS, TOWERS, READY_TOWERS, ANY)
+
+    # Skill bitmasks, see get_wizard_profile.
+    STRONG_SKILLS = (1 << SkillType.FROST_BOLT) | (1 << SkillType.FIREBALL)
+    MAGICAL_DAMAGE_SKILLS = (
+        (1 << SkillType.MAGICAL_DAMAGE_BONUS_PASSIVE_1) | (1 << SkillType.MAGICAL_DAMAGE_BONUS_AURA_1) |
+        (1 << SkillType.MAGICAL_DAMAGE_BONUS_PASSIVE_2) | (1 << SkillType.MAGICAL_DAMAGE_BONUS_AURA_2)
+    )
+
+    def __init__(self, map_size=4000.0):
+        super().__init__(map_size)
+        self.counts = tuple([0] * (self.size * self.size) for _ in ThreatMap.ALL_KINDS)
+        self.damage = [0.0] * (self.size * self.size)
+        self.tick_index = None
+        self.attack_faction = None
+        # Kinds, position, reach and damage of each threat by unit id, as it was put on the grid.
+        self.threat_by_id = {}
+        # Level, skill count, skill bitmask, kinds and damage of each enemy wizard by id.
+        self.profile_by_id = {}
+        # A ready wizard or tower is a danger unless there's enough life left to take this.
+        self.wizard_damage = 0.0
+        self.tower_damage = 0.0
+
+    def update(self, world: World, game: Game, attack_faction, arrays: WorldArrays = None):
+        if world.tick_index == self.tick_index and attack_faction == self.attack_faction:
+            return
+        if attack_faction != self.attack_faction:
+            for unit_id in list(self.threat_by_id):
+                self.apply(self.threat_by_id.pop(unit_id), -1)
+        self.tick_index = world.tick_index
+        self.attack_faction = attack_faction
+        self.wizard_damage = max(game.staff_damage, game.magic_missile_direct_damage, game.frost_bolt_direct_damage)
+        self.tower_damage = game.guardian_tower_damage
+
+        threat_by_id = {unit.id: threat for unit, threat in self.get_threats(world, game, attack_faction, arrays)}
+        # Take out threats which are gone or changed, then put in the new ones. Moved threats only touch the edges.
+        for unit_id, threat in list(self.threat_by_id.items()):
+            new_threat = threat_by_id.get(unit_id)
+            if new_threat == threat:
+                continue
+            if new_threat is not None and ThreatMap.is_same_kind(threat, new_threat):
+                self.move(threat, new_threat)
+                self.threat_by_id[unit_id] = new_threat
+            else:
+                self.apply(self.threat_by_id.pop(unit_id), -1)
+        for unit_id, threat in threat_by_id.items():
+            if unit_id not in self.threat_by_id:
+                self.apply(threat, 1)
+                self.threat_by_id[unit_id] = threat
+
+    def apply(self, threat, sign):
+        kinds, x, y, reach, damage = threat
+        for start, end in self.get_disk_spans(x, y, reach + ThreatMap.CELL_MARGIN):
+            self.apply_span(kinds, damage, start, end, sign)
+
+    def move(self, threat, new_threat):
+        kinds, x, y, reach, damage = threat
+        _, new_x, new_y, _, _ = new_threat
+        size, reach = self.size, reach + ThreatMap.CELL_MARGIN
+        spans = {start // size: (start, end) for start, end in self.get_disk_spans(x, y, reach)}
+        new_spans = {start // size: (start, end) for start, end in self.get_disk_spans(new_x, new_y, reach)}
+        for row in spans.keys() | new_spans.keys():
+            start, end = spans.get(row, (0, 0))
+            new_start, new_end = new_spans.get(row, (0, 0))
+            if start >= new_end or new_start >= end:
+                # The spans don't overlap.
+                self.apply_span(kinds, damage, start, end, -1)
+                self.apply_span(kinds, damage, new_start, new_end, 1)
+                continue
+            self.apply_span(kinds, damage, start, new_start, -1)
+            self.apply_span(kinds, damage, new_end, end, -1)
+            self.apply_span(kinds, damage, new_start, start, 1)
+            self.apply_span(kinds, damage, end, new_end, 1)
+
+    def apply_span(self, kinds, damage, start, end, sign):
+        if start >= end:
+            return
+        for kind in kinds:
+            counts = self.counts[kind]
+            counts[start:end] = [count + sign for count in counts[start:end]]
+        if damage:
+            self.damage[start:end] = [value + sign * damage for value in self.damage[start:end]]
+
+    @staticmethod
+    def is_same_kind(threat, other_threat):
+        # Everything but the position is the same.
+        return threat[0] == other_threat[0] and threat[3:] == other_threat[3:]
+
+    def get_threats(self, world: World, game: Game, attack_faction, arrays: WorldArrays = None):
+        # Enemy units with what they are and how far they hit, plus a span of two wizard radii. Values are read from
+        # the columnar view of the world when there's one.
+        span = 2.0 * game.wizard_radius
+        for wizard, x, y, cast_range, remaining_ticks in ThreatMap.get_enemies(
+            world.wizards, arrays and arrays.wizards, attack_faction,
+            ("x", "y", "cast_range", "remaining_action_cooldown_ticks"),
+        ):
+            if remaining_ticks > 0.5 * game.wizard_action_cooldown_ticks:
+                continue
+            _, _, _, kinds, damage = self.get_wizard_profile(wizard, game)
+            yield wizard, (kinds, x, y, cast_range + span, damage)
+        for minion, x, y, minion_type in ThreatMap.get_enemies(
+            world.minions, arrays and arrays.minions, attack_faction, ("x", "y", "type"),
+        ):
+            if minion_type == MinionType.FETISH_BLOWDART:
+                reach, damage = game.fetish_blowdart_attack_range, game.dart_direct_damage
+            else:
+                reach, damage = game.orc_woodcutter_attack_range, game.orc_woodcutter_damage
+            yield minion, ((ThreatMap.ANY, ThreatMap.MINIONS), x, y, reach + span, damage)
+        for building, x, y, cooldown_ticks, remaining_ticks in ThreatMap.get_enemies(
+            world.buildings, arrays and arrays.buildings, attack_faction,
+            ("x", "y", "cooldown_ticks", "remaining_action_cooldown_ticks"),
+        ):
+            if remaining_ticks > 0.5 * cooldown_ticks:
+                kinds, damage = (ThreatMap.ANY, ThreatMap.TOWERS), 0.0
+            else:
+                kinds, damage = (ThreatMap.ANY, ThreatMap.TOWERS, ThreatMap.READY_TOWERS), game.guardian_tower_damage
+            yield building, (kinds, x, y, game.guardian_tower_attack_range + span, damage)
+
+    @staticmethod
+    def get_enemies(units, unit_arrays: UnitArrays, attack_faction, column_names):
+        # Units of the faction with their values of the columns.
+        if unit_arrays is not None:
+            return unit_arrays.get_faction_rows(attack_faction, column_names)
+        get_values = operator.attrgetter(*column_names)
+        return ((unit, ) + get_values(unit) for unit in units or () if unit.faction == attack_faction)
+
+    def get_wizard_profile(self, wizard: Wizard, game: Game):
+        # Skills only change on level up, the profile is kept until the level or the number of skills changes.
+        profile = self.profile_by_id.get(wizard.id)
+        if profile is None or profile[0] != wizard.level or profile[1] != len(wizard.skills):
+            profile = self.profile_by_id[wizard.id] = ThreatMap.build_wizard_profile(wizard, game)
+        return profile
+
+    @staticmethod
+    def build_wizard_profile(wizard: Wizard, game: Game):
+        # Kinds of the wizard and the most damage of a single cast. Damage bonus is one level per passive or aura
+        # skill of the wizard itself, auras of its allies aren't counted. Cast range comes with the bonuses already.
+        skill_mask = 0
+        for skill in wizard.skills:
+            skill_mask |= 1 << skill
+        damage = game.magic_missile_direct_damage
+        if skill_mask & (1 << SkillType.FROST_BOLT):
+            damage = max(damage, game.frost_bolt_direct_damage)
+        if skill_mask & (1 << SkillType.FIREBALL):
+            damage = max(damage, game.fireball_explosion_max_damage)
+        damage_skill_count = bin(skill_mask & ThreatMap.MAGICAL_DAMAGE_SKILLS).count("1")
+        damage += game.magical_damage_bonus_per_skill_level * damage_skill_count
+        if skill_mask & ThreatMap.STRONG_SKILLS:
+            kinds = (ThreatMap.ANY, ThreatMap.WIZARDS, ThreatMap.STRONG_WIZARDS)
+        else:
+            kinds = (ThreatMap.ANY, ThreatMap.WIZARDS)
+        return wizard.level, len(wizard.skills), skill_mask, kinds, damage
+
+    def is_in_danger(self, x: float, y: float, max_life_risk: float) -> bool:
+        index = self.get_index(x, y)
+        counts = self.counts
+        if counts[ThreatMap.MINIONS][index] or counts[ThreatMap.STRONG_WIZARDS][index]:
+            return True
+        if counts[ThreatMap.WIZARDS][index] and max_life_risk < self.wizard_damage:
+            return True
+        if counts[ThreatMap.TOWERS][index] and max_life_risk < 0.0:
+            return True
+        if counts[ThreatMap.READY_TOWERS][index] and max_life_risk <= self.tower_damage:
+            return True
+        return False
+
+    def get_damage(self, x: float, y: float) -> float:
+        return self.damage[self.get_index(x, y)]
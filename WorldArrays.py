@@ -0,0 +1,95 @@
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from model.World import World
+
+
+LIVING_UNIT_COLUMNS = ("id", "x", "y", "speed_x", "speed_y", "radius", "life", "max_life", "faction")
+
+WIZARD_COLUMNS = LIVING_UNIT_COLUMNS + (
+    "mana", "level", "vision_range", "cast_range", "remaining_action_cooldown_ticks",
+)
+MINION_COLUMNS = LIVING_UNIT_COLUMNS + (
+    "type", "vision_range", "damage", "cooldown_ticks", "remaining_action_cooldown_ticks",
+)
+BUILDING_COLUMNS = LIVING_UNIT_COLUMNS + (
+    "type", "vision_range", "attack_range", "damage", "cooldown_ticks", "remaining_action_cooldown_ticks",
+)
+TREE_COLUMNS = LIVING_UNIT_COLUMNS
+PROJECTILE_COLUMNS = ("id", "x", "y", "speed_x", "speed_y", "radius", "faction", "type", "owner_unit_id")
+
+
+class UnitArrays:
+    # Columns of one unit kind, each column is a contiguous float64 array named after the model attribute.
+    # Missing enum values (None) become NaN.
+
+    def __init__(self, units, column_names):
+        self.units = units if units is not None else []
+        self.column_names = column_names
+
+        if self.units:
+            rows = list(map(operator.attrgetter(*column_names), self.units))
+            columns = numpy.array(rows, dtype=numpy.float64).T.copy()
+        else:
+            columns = numpy.empty((len(column_names), 0), dtype=numpy.float64)
+
+        for column_name, column in zip(column_names, columns):
+            setattr(self, column_name, column)
+
+    def __len__(self):
+        return len(self.units)
+
+    def get_distances_to(self, x, y):
+        return numpy.hypot(self.x - x, self.y - y)
+
+    def get_faction_rows(self, faction, column_names):
+        # Units of the faction with their values of the columns, as Python objects.
+        indexes = numpy.flatnonzero(self.faction == faction)
+        columns = [getattr(self, column_name)[indexes].tolist() for column_name in column_names]
+        return zip([self.units[index] for index in indexes.tolist()], *columns)
+
+
+class WorldArrays:
+    def __init__(self, world: World, previous=None):
+        # Unit lists which didn't change since the previous tick keep their arrays.
+        self.wizards = WorldArrays.build(world.wizards, WIZARD_COLUMNS, previous and previous.wizards)
+        self.minions = WorldArrays.build(world.minions, MINION_COLUMNS, previous and previous.minions)
+        self.buildings = WorldArrays.build(world.buildings, BUILDING_COLUMNS, previous and previous.buildings)
+        self.trees = WorldArrays.build(world.trees, TREE_COLUMNS, previous and previous.trees)
+        self.projectiles = WorldArrays.build(world.projectiles, PROJECTILE_COLUMNS, previous and previous.projectiles)
+
+        # Everything a wizard may bump into or a projectile may hit.
+        obstacles = (self.wizards, self.minions, self.buildings, self.trees)
+        if previous is not None and all(
+            units is previous_units for units, previous_units in zip(obstacles, previous.obstacles)
+        ):
+            self.obstacle_units = previous.obstacle_units
+            self.obstacle_ids = previous.obstacle_ids
+            self.obstacle_x = previous.obstacle_x
+            self.obstacle_y = previous.obstacle_y
+            self.obstacle_speed_x = previous.obstacle_speed_x
+            self.obstacle_speed_y = previous.obstacle_speed_y
+            self.obstacle_radius = previous.obstacle_radius
+        else:
+            self.obstacle_units = [unit for units in obstacles for unit in units.units]
+            self.obstacle_ids = numpy.concatenate([units.id for units in obstacles]).astype(numpy.int64)
+            self.obstacle_x = numpy.concatenate([units.x for units in obstacles])
+            self.obstacle_y = numpy.concatenate([units.y for units in obstacles])
+            self.obstacle_speed_x = numpy.concatenate([units.speed_x for units in obstacles])
+            self.obstacle_speed_y = numpy.concatenate([units.speed_y for units in obstacles])
+            self.obstacle_radius = numpy.concatenate([units.radius for units in obstacles])
+        self.obstacles = obstacles
+
+    @staticmethod
+    def build(units, column_names, previous):
+        if previous is not None and previous.units is units:
+            return previous
+        return UnitArrays(units, column_names)
+
+    @staticmethod
+    def is_available():
+        return numpy is not None
@@ -0,0 +1,128 @@
+from model.Game import Game
+from model.Minion import Minion
+from model.World import World
+from SpatialIndex import SpatialIndex
+
+
+class WorldState:
+
+    def __init__(self, unit_by_id):
+        # Units cached by the client for flag-100 references. A unit out of view isn't known to be dead, the server may
+        # refer to it when it comes back. Only minions which are known to be dead are evicted, see evict_dead_minions.
+        self.unit_by_id = unit_by_id
+        self.visible_unit_by_id = {}
+        self.wizards = None
+        self.minions = None
+        self.buildings = None
+        self.trees = None
+        self.added_ids = set()
+        self.removed_ids = set()
+        self.changed_ids = set()
+        self.arrays = None
+        self.spatial_index = SpatialIndex()
+        # Farthest a minion gets from its last known position while it's still in sight, None until the game is known.
+        self.minion_reach = None
+
+    def set_game(self, game: Game):
+        self.minion_reach = game.minion_speed + game.minion_radius
+
+    def update(self, world: World):
+        # Keep the previous lists if none of their units changed.
+        world.minions = self.minions = WorldState.reuse_units(self.minions, world.minions)
+        world.buildings = self.buildings = WorldState.reuse_units(self.buildings, world.buildings)
+        world.trees = self.trees = WorldState.reuse_units(self.trees, world.trees)
+        self.wizards = world.wizards
+
+        visible_unit_by_id = {}
+        for units in (world.wizards, world.minions, world.buildings, world.trees):
+            if units is not None:
+                for unit in units:
+                    visible_unit_by_id[unit.id] = unit
+
+        previous_unit_by_id = self.visible_unit_by_id
+        self.added_ids = visible_unit_by_id.keys() - previous_unit_by_id.keys()
+        self.removed_ids = previous_unit_by_id.keys() - visible_unit_by_id.keys()
+        self.changed_ids = {
+            unit_id
+            for unit_id, unit in visible_unit_by_id.items()
+            if unit_id in previous_unit_by_id and previous_unit_by_id[unit_id] is not unit
+        }
+        self.visible_unit_by_id = visible_unit_by_id
+        self.evict_dead_minions(world, previous_unit_by_id)
+        self.attach(world)
+
+    def update_copy(self, world: World, added_ids, removed_ids, changed_ids):
+        # A copy of the client world in another process, see StrategyPool. Its units are new objects each tick, but the
+        # client has found which of them changed. The others are replaced by the units of the previous tick, so that
+        # unchanged lists are reused and the indexes are updated incrementally as with the client.
+        previous_unit_by_id = self.visible_unit_by_id
+        new_ids = added_ids | changed_ids
+        unit_lists = [
+            [unit if unit.id in new_ids else previous_unit_by_id.get(unit.id, unit) for unit in units]
+            if units is not None else None
+            for units in (world.wizards, world.minions, world.buildings, world.trees)
+        ]
+        world.wizards = self.wizards = unit_lists[0]
+        world.minions = self.minions = WorldState.reuse_units(self.minions, unit_lists[1])
+        world.buildings = self.buildings = WorldState.reuse_units(self.buildings, unit_lists[2])
+        world.trees = self.trees = WorldState.reuse_units(self.trees, unit_lists[3])
+
+        self.visible_unit_by_id = {
+            unit.id: unit
+            for units in (world.wizards, world.minions, world.buildings, world.trees) if units is not None
+            for unit in units
+        }
+        self.added_ids = added_ids
+        self.removed_ids = removed_ids
+        self.changed_ids = changed_ids
+        self.attach(world)
+
+    def attach(self, world: World):
+        world.added_unit_ids = self.added_ids
+        world.removed_unit_ids = self.removed_ids
+        world.changed_unit_ids = self.changed_ids
+        world.arrays_factory = self.build_arrays
+        world.spatial_index_factory = self.build_spatial_index
+
+    def evict_dead_minions(self, world: World, previous_unit_by_id):
+        # A minion which vanished while it couldn't have left the sight of our units in one tick has died.
+        if self.minion_reach is None or not self.removed_ids:
+            return
+        player = world.get_my_player() if world.players is not None else None
+        if player is None:
+            return
+        observers = [
+            unit
+            for units in (world.wizards, world.minions, world.buildings) if units is not None
+            for unit in units if unit.faction == player.faction
+        ]
+        for unit_id in self.removed_ids:
+            minion = previous_unit_by_id[unit_id]
+            if not isinstance(minion, Minion):
+                continue
+            if any(
+                observer.get_distance_to_unit(minion) + self.minion_reach < observer.vision_range
+                for observer in observers
+            ):
+                self.unit_by_id.pop(unit_id, None)
+
+    def build_arrays(self, world: World):
+        # Imported on first use, numpy takes most of the startup time.
+        from WorldArrays import WorldArrays
+        if not WorldArrays.is_available():
+            return None
+        self.arrays = WorldArrays(world, self.arrays)
+        return self.arrays
+
+    def build_spatial_index(self, world: World):
+        self.spatial_index.update(world)
+        return self.spatial_index
+
+    @staticmethod
+    def reuse_units(previous_units, units):
+        if previous_units is None or units is None or len(previous_units) != len(units):
+            return units
+        for previous_unit, unit in zip(previous_units, units):
+            if previous_unit is not unit:
+                return units
+        return previous_units
@@ -4,6 +4,8 @@ from model.Faction import Faction
 
 
 class Bonus(CircularUnit):
+    __slots__ = ("type",)
+
     def __init__(self, id, x, y, speed_x, speed_y, angle, faction: (None, Faction), radius, type: (None, BonusType)):
         CircularUnit.__init__(self, id, x, y, speed_x, speed_y, angle, faction, radius)
 
@@ -4,6 +4,8 @@ from model.LivingUnit import LivingUnit
 
 
 class Building(LivingUnit):
+    __slots__ = ("type", "vision_range", "attack_range", "damage", "cooldown_ticks", "remaining_action_cooldown_ticks")
+
     def __init__(self, id, x, y, speed_x, speed_y, angle, faction: (None, Faction), radius, life, max_life, statuses,
                  type: (None, BuildingType), vision_range, attack_range, damage, cooldown_ticks,
                  remaining_action_cooldown_ticks):
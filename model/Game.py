@@ -1,4 +1,37 @@
 class Game:
+    __slots__ = (
+        "random_seed", "tick_count", "map_size", "skills_enabled", "raw_messages_enabled",
+        "friendly_fire_damage_factor", "building_damage_score_factor", "building_elimination_score_factor",
+        "minion_damage_score_factor", "minion_elimination_score_factor", "wizard_damage_score_factor",
+        "wizard_elimination_score_factor", "team_working_score_factor", "victory_score", "score_gain_range",
+        "raw_message_max_length", "raw_message_transmission_speed", "wizard_radius", "wizard_cast_range",
+        "wizard_vision_range", "wizard_forward_speed", "wizard_backward_speed", "wizard_strafe_speed",
+        "wizard_base_life", "wizard_life_growth_per_level", "wizard_base_mana", "wizard_mana_growth_per_level",
+        "wizard_base_life_regeneration", "wizard_life_regeneration_growth_per_level", "wizard_base_mana_regeneration",
+        "wizard_mana_regeneration_growth_per_level", "wizard_max_turn_angle", "wizard_max_resurrection_delay_ticks",
+        "wizard_min_resurrection_delay_ticks", "wizard_action_cooldown_ticks", "staff_cooldown_ticks",
+        "magic_missile_cooldown_ticks", "frost_bolt_cooldown_ticks", "fireball_cooldown_ticks", "haste_cooldown_ticks",
+        "shield_cooldown_ticks", "magic_missile_manacost", "frost_bolt_manacost", "fireball_manacost", "haste_manacost",
+        "shield_manacost", "staff_damage", "staff_sector", "staff_range", "level_up_xp_values", "minion_radius",
+        "minion_vision_range", "minion_speed", "minion_max_turn_angle", "minion_life",
+        "faction_minion_appearance_interval_ticks", "orc_woodcutter_action_cooldown_ticks", "orc_woodcutter_damage",
+        "orc_woodcutter_attack_sector", "orc_woodcutter_attack_range", "fetish_blowdart_action_cooldown_ticks",
+        "fetish_blowdart_attack_range", "fetish_blowdart_attack_sector", "bonus_radius",
+        "bonus_appearance_interval_ticks", "bonus_score_amount", "dart_radius", "dart_speed", "dart_direct_damage",
+        "magic_missile_radius", "magic_missile_speed", "magic_missile_direct_damage", "frost_bolt_radius",
+        "frost_bolt_speed", "frost_bolt_direct_damage", "fireball_radius", "fireball_speed",
+        "fireball_explosion_max_damage_range", "fireball_explosion_min_damage_range", "fireball_explosion_max_damage",
+        "fireball_explosion_min_damage", "guardian_tower_radius", "guardian_tower_vision_range", "guardian_tower_life",
+        "guardian_tower_attack_range", "guardian_tower_damage", "guardian_tower_cooldown_ticks", "faction_base_radius",
+        "faction_base_vision_range", "faction_base_life", "faction_base_attack_range", "faction_base_damage",
+        "faction_base_cooldown_ticks", "burning_duration_ticks", "burning_summary_damage", "empowered_duration_ticks",
+        "empowered_damage_factor", "frozen_duration_ticks", "hastened_duration_ticks", "hastened_bonus_duration_factor",
+        "hastened_movement_bonus_factor", "hastened_rotation_bonus_factor", "shielded_duration_ticks",
+        "shielded_bonus_duration_factor", "shielded_direct_damage_absorption_factor", "aura_skill_range",
+        "range_bonus_per_skill_level", "magical_damage_bonus_per_skill_level", "staff_damage_bonus_per_skill_level",
+        "movement_bonus_factor_per_skill_level", "magical_damage_absorption_per_skill_level"
+    )
+
     def __init__(self, random_seed, tick_count, map_size, skills_enabled, raw_messages_enabled,
                  friendly_fire_damage_factor, building_damage_score_factor, building_elimination_score_factor,
                  minion_damage_score_factor, minion_elimination_score_factor, wizard_damage_score_factor,
@@ -3,6 +3,8 @@ from model.Faction import Faction
 
 
 class LivingUnit(CircularUnit):
+    __slots__ = ("life", "max_life", "statuses")
+
     def __init__(self, id, x, y, speed_x, speed_y, angle, faction: (None, Faction), radius, life, max_life, statuses):
         CircularUnit.__init__(self, id, x, y, speed_x, speed_y, angle, faction, radius)
 
@@ -3,6 +3,8 @@ from model.SkillType import SkillType
 
 
 class Message:
+    __slots__ = ("lane", "skill_to_learn", "raw_message")
+
     def __init__(self, lane: (None, LaneType), skill_to_learn: (None, SkillType), raw_message):
         self.lane = lane
         self.skill_to_learn = skill_to_learn
@@ -1,4 +1,9 @@
 class Move:
+    __slots__ = (
+        "speed", "strafe_speed", "turn", "action", "cast_angle", "min_cast_distance", "max_cast_distance",
+        "status_target_id", "skill_to_learn", "messages"
+    )
+
     def __init__(self):
         self.speed = 0.0
         self.strafe_speed = 0.0
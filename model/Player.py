@@ -2,6 +2,8 @@ from model.Faction import Faction
 
 
 class Player:
+    __slots__ = ("id", "me", "name", "strategy_crashed", "score", "faction")
+
     def __init__(self, id, me, name, strategy_crashed, score, faction: (None, Faction)):
         self.id = id
         self.me = me
@@ -2,6 +2,8 @@ from model.World import World
 
 
 class PlayerContext:
+    __slots__ = ("wizards", "world")
+
     def __init__(self, wizards, world: (None, World)):
         self.wizards = wizards
         self.world = world
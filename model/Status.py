@@ -2,6 +2,8 @@ from model.StatusType import StatusType
 
 
 class Status:
+    __slots__ = ("id", "type", "wizard_id", "player_id", "remaining_duration_ticks")
+
     def __init__(self, id, type: (None, StatusType), wizard_id, player_id, remaining_duration_ticks):
         self.id = id
         self.type = type
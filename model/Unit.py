@@ -4,6 +4,8 @@ from model.Faction import Faction
 
 
 class Unit:
+    __slots__ = ("id", "x", "y", "speed_x", "speed_y", "angle", "faction")
+
     def __init__(self, id, x, y, speed_x, speed_y, angle, faction: (None, Faction)):
         self.id = id
         self.x = x
@@ -15,12 +17,11 @@ class Unit:
 
     def get_angle_to(self, x, y):
         absolute_angle_to = atan2(y - self.y, x - self.x)
-        relative_angle_to = absolute_angle_to - self.angle
+        relative_angle_to = fmod(absolute_angle_to - self.angle, 2.0 * pi)
 
-        while relative_angle_to > pi:
+        if relative_angle_to > pi:
             relative_angle_to -= 2.0 * pi
-
-        while relative_angle_to < -pi:
+        elif relative_angle_to < -pi:
             relative_angle_to += 2.0 * pi
 
         return relative_angle_to
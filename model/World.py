@@ -1,4 +1,10 @@
 class World:
+    __slots__ = (
+        "tick_index", "tick_count", "width", "height", "players", "wizards", "minions", "projectiles", "bonuses",
+        "buildings", "trees", "added_unit_ids", "removed_unit_ids", "changed_unit_ids", "arrays", "arrays_factory",
+        "spatial_index", "spatial_index_factory"
+    )
+
     def __init__(self, tick_index, tick_count, width, height, players, wizards, minions, projectiles, bonuses,
                  buildings, trees):
         self.tick_index = tick_index
@@ -12,6 +18,18 @@ class World:
         self.bonuses = bonuses
         self.buildings = buildings
         self.trees = trees
+        # Filled in by RemoteProcessClient: ids of units which appeared, disappeared or were updated since the
+        # previous tick.
+        self.added_unit_ids = None
+        self.removed_unit_ids = None
+        self.changed_unit_ids = None
+        # Columnar view of the units, see WorldArrays. Built on first get_arrays() call by the factory set by
+        # RemoteProcessClient.
+        self.arrays = None
+        self.arrays_factory = None
+        # Grid index of the units, see SpatialIndex. Built on first get_spatial_index() call the same way.
+        self.spatial_index = None
+        self.spatial_index_factory = None
 
     def get_my_player(self):
         for player in self.players:
@@ -19,3 +37,15 @@ class World:
                 return player
 
         return None
+
+    def get_arrays(self):
+        if self.arrays is None and self.arrays_factory is not None:
+            self.arrays = self.arrays_factory(self)
+
+        return self.arrays
+
+    def get_spatial_index(self):
+        if self.spatial_index is None and self.spatial_index_factory is not None:
+            self.spatial_index = self.spatial_index_factory(self)
+
+        return self.spatial_index